@@ -0,0 +1,45 @@
+"""
+Helpers shared by test/api and test/async, which test/run runs under python 3.
+"""
+
+import csv
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+failed = False
+
+
+def check(name, ok):
+    global failed
+    if ok:
+        print("OK: %s" % name)
+    else:
+        print("FAILED: %s" % name)
+        failed = True
+
+
+def finish():
+    if failed:
+        sys.exit(1)
+
+
+def expected(case):
+    with open("test/%s.csv" % case, "r", encoding="utf-8", newline="") as f:
+        return f.read().replace("\r", "")
+
+
+def workbook(case):
+    if os.path.exists("test/%s.xlsm" % case):
+        return "test/%s.xlsm" % case
+    return "test/%s.xlsx" % case
+
+
+def to_csv(rows):
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    for row in rows:
+        writer.writerow(row)
+    return output.getvalue()
@@ -26,16 +26,47 @@ __author__ = "Dilshod Temirkhodjaev <tdilshod@gmail.com>"
 __license__ = "MIT"
 __version__ = "0.8.6"
 
-import csv, datetime, zipfile, sys, os, re, signal, io
+import csv, datetime, zipfile, sys, os, re, signal, io, mmap, tempfile, math, multiprocessing, fnmatch, json, time, threading, functools, shutil
 import xml.parsers.expat
-from decimal import Decimal, localcontext, ROUND_HALF_UP
-from xml.dom import minidom
+from array import array
+from decimal import Decimal, ROUND_HALF_UP
 
 try:
     # python2.4
     from cStringIO import StringIO
 except:
     pass
+try:
+    from collections import OrderedDict
+except ImportError:
+    # python2.6 or older
+    OrderedDict = None
+try:
+    import asyncio
+except ImportError:
+    # python2
+    asyncio = None
+try:
+    import queue
+except ImportError:
+    # python2
+    import Queue as queue
+try:
+    from time import perf_counter, process_time
+except ImportError:
+    # python2
+    perf_counter = process_time = time.time
+try:
+    import numpy
+except ImportError:
+    # optional, column batches are returned as array and list objects without it
+    numpy = None
+try:
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    from concurrent.futures import CancelledError as FutureCancelledError, TimeoutError as FutureTimeoutError
+except ImportError:
+    # python2
+    ProcessPoolExecutor = None
 try:
     from argparse import ArgumentParser
 except:
@@ -43,7 +74,7 @@ except:
     from optparse import OptionParser
 
 try:
-    from typing import Union, Optional, Dict, Any, IO, List, TextIO, BinaryIO
+    from typing import Union, Optional, Dict, Any, IO, List, TextIO, BinaryIO, Iterator, Tuple, Callable, Sequence
     from types import TracebackType
 except ImportError:
     # python2.4 or older versions without typing
@@ -55,6 +86,10 @@ except ImportError:
     List = None
     TextIO = None
     BinaryIO = None
+    Iterator = None
+    Tuple = None
+    Callable = None
+    Sequence = None
     TracebackType = None
 
 # see also ruby-roo lib at: http://github.com/hmcgowan/roo
@@ -146,6 +181,14 @@ CONTENT_TYPES = set((
     'relationships',
 ))
 
+SHARED_STRINGS_MODES = ("list", "packed", "indexed")
+VALUE_MODES = ("formatted", "native", "serial")
+SHARED_STRINGS_CACHE_SIZE = 10000
+STDIN_SPOOL_SIZE = 64 * 1024 * 1024
+STDIN_COPY_CHUNK_SIZE = 1024 * 1024
+# seconds an async reader waits for room in its queue before checking again whether it was cancelled
+ASYNC_PUT_WAIT = 0.1
+
 DEFAULT_APP_PATH = "/xl"
 DEFAULT_WORKBOOK_PATH = DEFAULT_APP_PATH + "/workbook.xml"
 
@@ -165,10 +208,20 @@ class OutFileAlreadyExistsException(XlsxException):
     pass
 
 
+class SheetWindowDone(Exception):
+    """Raised from the parser handlers once the requested rows have been written"""
+    pass
+
+
 class XlsxValueError(XlsxException):
     pass
 
 
+class ConversionCancelled(XlsxException):
+    """Raised while reading a sheet after the conversion was cancelled"""
+    pass
+
+
 class Xlsx2csv:
     """
      Usage:
@@ -195,6 +248,28 @@ class Xlsx2csv:
        exclude_sheet_pattern - exclude sheets named matching given pattern
        exclude_hidden_sheets - exclude hidden sheets
        skip_hidden_rows - skip hidden rows
+       shared_strings_mode - "list" keeps shared strings in memory, "packed" keeps them in memory
+                             as a single utf-8 buffer, "indexed" spools them to a temporary file
+                             and decodes them on demand
+       shared_strings_cache_size - number of decoded strings cached in "indexed" mode
+       jobs - number of worker processes converting sheets in parallel when processing all sheets
+       stdin_spool_size - bytes of a workbook read from non-seekable stdin kept in memory, larger input
+         is spooled to a temporary file, 0 keeps all of it in memory
+       stdin_spool_dir - directory of the stdin spool file, None uses the default temporary directory
+       columns - only output the given columns in the given order, like "A,C:F"
+       rows - only output rows of the window, like "10:20", parsing stops after its last row
+       max_rows - stop after writing the given number of rows of a sheet
+       read_ahead - number of sheet chunks inflated ahead by a background thread while the parser
+         works on the current one, 0 reads and parses in turn
+       read_chunk_size - bytes of uncompressed sheet data handed to the parser at once
+       write_batch - rows passed to the csv writer at once, 1 writes every row as it is read
+       write_behind - number of row batches queued for a background thread writing them, 0 writes
+         from the parsing thread
+       write_buffer - buffer size in bytes of opened output files, 1 buffers lines, -1 uses the default
+       progress_every - rows between calls of the progress callback given to convert()
+       stats - collect phase times and counters into the stats attribute, see Stats
+       values - "formatted" applies number formats, "native" gives int, float, bool, datetime, time
+                and str values, "serial" gives numbers and date serials as floats
     """
 
     def __init__(self, xlsxfile, **options):
@@ -221,10 +296,54 @@ class Xlsx2csv:
         options.setdefault("skip_hidden_rows", True)
         options.setdefault("ignore_invalid_char_data", False)
         options.setdefault("ignore_percentage", False)
+        options.setdefault("shared_strings_mode", "list")
+        options.setdefault("shared_strings_cache_size", SHARED_STRINGS_CACHE_SIZE)
+        options.setdefault("jobs", 1)
+        options.setdefault("stdin_spool_size", STDIN_SPOOL_SIZE)
+        options.setdefault("stdin_spool_dir", None)
+        options.setdefault("columns", None)
+        options.setdefault("rows", None)
+        options.setdefault("max_rows", None)
+        options.setdefault("values", "formatted")
+        options.setdefault("stats", False)
+        options.setdefault("progress_every", 100000)
+        options.setdefault("read_ahead", 0)
+        options.setdefault("write_batch", 1)
+        options.setdefault("write_behind", 0)
+        options.setdefault("write_buffer", -1)
+        options.setdefault("read_chunk_size", SHEET_READ_CHUNK_SIZE)
 
         self.options = options
         self.py3 = sys.version_info[0] == 3
         self.ziphandle = None
+        self._shared_strings = None
+        # styles and shared strings are parsed once, also when sheets are opened from several threads
+        self._parse_lock = threading.Lock()
+        self.stats = Stats() if options['stats'] else None
+        self._spool = None
+
+        if options['shared_strings_mode'] not in SHARED_STRINGS_MODES:
+            raise XlsxValueError("Unknown shared strings mode: " + str(options['shared_strings_mode']))
+        if options['values'] not in VALUE_MODES:
+            raise XlsxValueError("Unknown values mode: " + str(options['values']))
+        if options['read_ahead'] < 0:
+            raise XlsxValueError("Invalid read ahead: " + str(options['read_ahead']))
+        if options['read_chunk_size'] < 1:
+            raise XlsxValueError("Invalid read chunk size: " + str(options['read_chunk_size']))
+        if options['progress_every'] < 1:
+            raise XlsxValueError("Invalid progress interval: " + str(options['progress_every']))
+        if options['write_buffer'] != -1 and options['write_buffer'] < 1:
+            raise XlsxValueError("Invalid write buffer: " + str(options['write_buffer']))
+        if options['write_batch'] < 1:
+            raise XlsxValueError("Invalid write batch: " + str(options['write_batch']))
+        if options['write_behind'] < 0:
+            raise XlsxValueError("Invalid write behind: " + str(options['write_behind']))
+        max_rows = options['max_rows']
+        if max_rows is not None and (not isinstance(max_rows, int) or isinstance(max_rows, bool) or max_rows < 0):
+            raise XlsxValueError("Invalid max rows: " + str(max_rows))
+        # parsed values are kept apart, options keep what the caller gave
+        self._columns = parse_columns(options['columns']) if options['columns'] else None
+        self._rows = parse_rows(options['rows']) if options['rows'] else None
 
         xlsxinputfile = None
         if xlsxfile == "-" and self.py3:
@@ -232,29 +351,78 @@ class Xlsx2csv:
             if sys.stdin.buffer.seekable():
                 xlsxinputfile = sys.stdin.buffer
             else:
-                xlsxinputfile = io.BytesIO(sys.stdin.buffer.read())
+                xlsxinputfile = self._spool_stdin()
         elif xlsxfile == "-" and not self.py3:
             raise ValueError("The - notation for STDIN is not supported for python2")
         else:
             xlsxinputfile = xlsxfile
+        # worker processes reopen the zip by path, sharing an open file between processes is not safe
+        self._xlsxpath = xlsxinputfile if isinstance(xlsxinputfile, str) else None
+        self._in_memory = isinstance(xlsxinputfile, io.BytesIO) or \
+            (self._spool is not None and not self._spool_rolled)
 
         try:
             self.ziphandle = zipfile.ZipFile(xlsxinputfile)
         except (zipfile.BadZipfile, IOError):
             raise InvalidXlsxFileException("Invalid xlsx file: " + str(xlsxfile))
+        # lowercase member name -> member name, the first of duplicate names wins like in a linear scan
+        self.members = {}
+        for name in self.ziphandle.namelist():
+            if name.lower() not in self.members:
+                self.members[name.lower()] = name
+        self._sheet_paths = None
+        self._styles = None
 
 
+        started = self.stats and self.stats.start()
         self.content_types = self._parse(ContentTypes, "/[Content_Types].xml")
-        self.shared_strings = self._parse(SharedStrings, self.content_types.types["shared_strings"])
-        self.styles = self._parse(Styles, self.content_types.types["styles"])
         self.workbook = self._parse(Workbook, self.content_types.types["workbook"])
         workbook_relationships = list(filter(lambda r: "book" in r, self.content_types.types["relationships"]))
         if len(workbook_relationships) > 0:
             self.workbook.relationships = self._parse(Relationships, workbook_relationships[0])
         else:
             self.workbook.relationships = Relationships()
+        if self.stats:
+            self.stats.stop("open", started)
+
+    @property
+    def styles(self):
+        # type: () -> Styles
+        """Cell styles, parsed on first access"""
+        if self._styles is None:
+            with self._parse_lock:
+                if self._styles is None:
+                    started = self.stats and self.stats.start()
+                    self._styles = self._parse(Styles, self.content_types.types["styles"])
+                    if self.stats:
+                        self.stats.stop("styles", started)
+        return self._styles
+
+    @property
+    def shared_strings(self):
+        # type: () -> SharedStrings
+        """Shared strings table, parsed on first access"""
+        if self._shared_strings is None:
+            with self._parse_lock:
+                if self._shared_strings is None:
+                    self._shared_strings = self._parse_shared_strings()
+        return self._shared_strings
+
+    def _parse_shared_strings(self):
+        # type: () -> SharedStrings
+        started = self.stats and self.stats.start()
+        shared_strings = SharedStrings(self.options['shared_strings_mode'],
+                                       self.options['shared_strings_cache_size'])
+        # escape before parsing, so strings are transformed once while they are stored
         if self.options['escape_strings']:
-            self.shared_strings.escape_strings()
+            shared_strings.escape_strings()
+        filehandle = self._filehandle(self.content_types.types["shared_strings"])
+        if filehandle:
+            shared_strings.parse(filehandle)
+            filehandle.close()
+        if self.stats:
+            self.stats.stop("shared_strings", started)
+        return shared_strings
 
     def __enter__(self):
         # type: () -> Xlsx2csv
@@ -274,6 +442,47 @@ class Xlsx2csv:
         if self.ziphandle:
             self.ziphandle.close()
             self.ziphandle = None
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        if self._shared_strings is not None:
+            self._shared_strings.close()
+
+    @classmethod
+    def inspect(cls, xlsxfile, dimensions=True):
+        # type: (Union[str, IO[bytes]], bool) -> Dict[str, Any]
+        """Read workbook properties and sheet list without parsing styles, shared strings or cells
+
+        Each sheet is reported with its index, name, state and, when dimensions is set,
+        the range of its <dimension> element or None.
+        """
+        with cls(xlsxfile) as xlsx2csv:
+            sheets = []
+            for s in xlsx2csv.workbook.sheets:
+                sheet = {
+                    'index': s['index'],
+                    'name': s['name'],
+                    'state': s['state'] or 'visible',
+                }
+                if dimensions:
+                    sheet['dimension'] = xlsx2csv.get_sheet_dimension(s['index'])
+                sheets.append(sheet)
+            return {
+                'date1904': xlsx2csv.workbook.date1904,
+                'sheets': sheets,
+            }
+
+    def get_sheet_dimension(self, sheetid):
+        # type: (int) -> Optional[str]
+        """Range of the sheet <dimension> element, like "A1:D20", reading the sheet only up to <sheetData>"""
+        parts = self._sheet_parts(sheetid)
+        if parts is None:
+            return None
+        filehandle = self._filehandle(parts[0])
+        try:
+            return SheetDimension().parse(filehandle)
+        finally:
+            filehandle.close()
 
     def getSheetIdByName(self, name):
         # type: (str) -> Optional[int]
@@ -282,15 +491,21 @@ class Xlsx2csv:
                 return s['index']
         return None
 
-    def convert(self, outfile, sheetid=1, sheetname=None):
-        # type: (Union[str, TextIO], int, Optional[str]) -> None
-        """outfile - path to file or filehandle"""
+    def convert(self, outfile, sheetid=1, sheetname=None, progress=None, cancel=None):
+        # type: (Union[str, TextIO], int, Optional[str], Optional[Callable[[int, Optional[int], float], None]], Optional[threading.Event]) -> None
+        """
+         outfile - path to file or filehandle
+         progress - called as progress(rows, total, rate) every progress_every rows of a sheet
+           and once when the sheet is done; total is the estimated row count of the sheet
+           or None, rate is in rows per second. With jobs > 1 it is called by the worker processes.
+         cancel - threading.Event, once it is set reading sheet data raises ConversionCancelled
+        """
         if sheetname:
             sheetid = self.getSheetIdByName(sheetname)
             if not sheetid:
                 raise XlsxException("Sheet '%s' not found" % sheetname)
         if sheetid > 0:
-            self._convert(sheetid, outfile)
+            self._convert(sheetid, outfile, progress, cancel)
         else:
             if isinstance(outfile, str):
                 if not os.path.exists(outfile):
@@ -302,39 +517,14 @@ class Xlsx2csv:
                     raise OutFileAlreadyExistsException("File " + str(outfile) + " already exists!")
                 outfile = outfile.open("w+", encoding=self.options['outputencoding'], newline="")
 
-            for s in self.workbook.sheets:
-                sheetname = s['name']
-                sheetstate = s['state']
-
-                # filter hidden sheets
-                if sheetstate in ('hidden', 'veryHidden') and self.options['exclude_hidden_sheets']:
-                    continue
-
-                # filter sheets by include pattern
-                include_sheet_pattern = self.options['include_sheet_pattern']
-                if type(include_sheet_pattern) == type(""):  # optparser lib fix
-                    include_sheet_pattern = [include_sheet_pattern]
-                if len(include_sheet_pattern) > 0:
-                    include = False
-                    for pattern in include_sheet_pattern:
-                        include = pattern and len(pattern) > 0 and re.match(pattern, sheetname)
-                        if include:
-                            break
-                    if not include:
-                        continue
-
-                # filter sheets by exclude pattern
-                exclude_sheet_pattern = self.options['exclude_sheet_pattern']
-                if type(exclude_sheet_pattern) == type(""):  # optparser lib fix
-                    exclude_sheet_pattern = [exclude_sheet_pattern]
-                exclude = False
-                for pattern in exclude_sheet_pattern:
-                    exclude = pattern and len(pattern) > 0 and re.match(pattern, sheetname)
-                    if exclude:
-                        break
-                if exclude:
-                    continue
+            sheets = self._selected_sheets()
+            context = self._fork_context()
+            if self.options['jobs'] > 1 and len(sheets) > 1 and context is not None:
+                self._convert_parallel(context, sheets, outfile, progress, cancel)
+                return
 
+            for s in sheets:
+                sheetname = s['name']
                 if not self.py3:
                     sheetname = sheetname.encode('utf-8')
                 of = outfile
@@ -342,15 +532,199 @@ class Xlsx2csv:
                     of = os.path.join(outfile, sheetname + '.csv')
                 elif self.options['sheetdelimiter'] and len(self.options['sheetdelimiter']):
                     of.write(self.options['sheetdelimiter'] + " " + str(s['index']) + " - " + sheetname + self.options['lineterminator'])
-                self._convert(s['index'], of)
+                self._convert(s['index'], of, progress, cancel)
 
-    def _convert(self, sheet_index, outfile):
+    def _selected_sheets(self):
+        # type: () -> List[Dict[str, Any]]
+        """Sheets to convert when processing all sheets, after hidden and name pattern filters"""
+        sheets = []
+        for s in self.workbook.sheets:
+            sheetname = s['name']
+            sheetstate = s['state']
+
+            # filter hidden sheets
+            if sheetstate in ('hidden', 'veryHidden') and self.options['exclude_hidden_sheets']:
+                continue
+
+            # filter sheets by include pattern
+            include_sheet_pattern = self.options['include_sheet_pattern']
+            if type(include_sheet_pattern) == type(""):  # optparser lib fix
+                include_sheet_pattern = [include_sheet_pattern]
+            if len(include_sheet_pattern) > 0:
+                include = False
+                for pattern in include_sheet_pattern:
+                    include = pattern and len(pattern) > 0 and re.match(pattern, sheetname)
+                    if include:
+                        break
+                if not include:
+                    continue
+
+            # filter sheets by exclude pattern
+            exclude_sheet_pattern = self.options['exclude_sheet_pattern']
+            if type(exclude_sheet_pattern) == type(""):  # optparser lib fix
+                exclude_sheet_pattern = [exclude_sheet_pattern]
+            exclude = False
+            for pattern in exclude_sheet_pattern:
+                exclude = pattern and len(pattern) > 0 and re.match(pattern, sheetname)
+                if exclude:
+                    break
+            if exclude:
+                continue
+            sheets.append(s)
+        return sheets
+
+    def _spool_stdin(self):
+        # type: () -> IO[bytes]
+        """Copy stdin to a file kept in memory up to stdin_spool_size bytes and on disk beyond"""
+        max_size = self.options['stdin_spool_size']
+        self._spool = tempfile.SpooledTemporaryFile(max_size, dir=self.options['stdin_spool_dir'])
+        for chunk in iter(lambda: sys.stdin.buffer.read(STDIN_COPY_CHUNK_SIZE), b""):
+            self._spool.write(chunk)
+        # the spool moves to disk once its size exceeds max_size, 0 never does
+        self._spool_rolled = max_size > 0 and self._spool.tell() > max_size
+        self._spool.seek(0)
+        return self._spool
+
+    def _fork_context(self):
+        # forked workers inherit parsed workbook, styles and shared strings without pickling them,
+        # the zip is reopened by path or copied with the process memory when read from memory,
+        # a file on disk read through one descriptor is not shared
+        if self._xlsxpath is None and not self._in_memory:
+            return None
+        try:
+            return multiprocessing.get_context("fork")
+        except (AttributeError, ValueError):
+            return None
+
+    def _convert_parallel(self, context, sheets, outfile, progress=None, cancel=None):
+        # load styles and shared strings before forking, so workers do not parse them again
+        self.styles
+        self.shared_strings
+        # sheets going to a stream are written by the workers to temporary files, which are copied
+        # to the stream in workbook order, so neither side holds a whole sheet in memory
+        tmpdir = None
+        if not isinstance(outfile, str):
+            tmpdir = tempfile.mkdtemp(prefix="xlsx2csv-")
+        jobs = []
+        for s in sheets:
+            if tmpdir is None:
+                of = os.path.join(outfile, s['name'] + '.csv')
+            else:
+                of = os.path.join(tmpdir, "%i.csv" % s['index'])
+            jobs.append((s['index'], of))
+        pool = context.Pool(min(self.options['jobs'], len(jobs)), _init_sheet_worker, (self, progress))
+        try:
+            # imap hands results back in workbook order
+            for s, (_, of), stats in zip(sheets, jobs, pool.imap(_convert_sheet_worker, jobs)):
+                if cancel is not None and cancel.is_set():
+                    raise ConversionCancelled("Conversion cancelled")
+                if stats:
+                    self.stats.merge(stats)
+                if tmpdir is None:
+                    continue
+                if self.options['sheetdelimiter'] and len(self.options['sheetdelimiter']):
+                    outfile.write(self.options['sheetdelimiter'] + " " + str(s['index']) + " - " + s['name'] + self.options['lineterminator'])
+                with io.open(of, "r", encoding=self.options['outputencoding'], newline="") as sheetfile:
+                    shutil.copyfileobj(sheetfile, outfile)
+                os.remove(of)
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+            if tmpdir is not None:
+                shutil.rmtree(tmpdir, ignore_errors=True)
+
+    def _reopen(self):
+        if self._xlsxpath is not None:
+            self.ziphandle.close()
+            self.ziphandle = zipfile.ZipFile(self._xlsxpath)
+
+    def iter_rows(self, sheetid=1, sheetname=None, cancel=None):
+        # type: (int, Optional[str], Optional[threading.Event]) -> Iterator[List[str]]
+        """
+         Yield formatted rows of a single sheet as lists, without going through csv writer.
+         Once the cancel event is set reading sheet data raises ConversionCancelled.
+        """
+        if sheetname:
+            sheetid = self.getSheetIdByName(sheetname)
+            if not sheetid:
+                raise XlsxException("Sheet '%s' not found" % sheetname)
+        sheet = self._open_sheet(sheetid, cancel=cancel)
+        try:
+            for row in sheet.iter_rows():
+                yield row
+        finally:
+            sheet.close()
+
+    def aiter_rows(self, sheetid=1, sheetname=None, batch_rows=1000, queue_size=4, executor=None):
+        # type: (int, Optional[str], int, int, Optional[Any]) -> AsyncRows
+        """
+         Async iterator over the rows of iter_rows(), to be used from a running event loop:
+           async with xlsx2csv.aiter_rows(sheetname="Sheet1") as rows:
+               async for row in rows:
+                   ...
+         Rows are read in executor (the loop default executor when None) and passed back in
+         batches of batch_rows through a queue of queue_size batches, reading waits while the
+         queue is full. Cancelling the iteration or aclose() stops reading and closes the sheet.
+        """
+        cancel = threading.Event()
+        return AsyncRows(self.iter_rows(sheetid, sheetname, cancel), cancel, batch_rows, queue_size, executor)
+
+    def aconvert(self, outfile, sheetid=1, sheetname=None, progress=None, executor=None):
+        # type: (Union[str, TextIO], int, Optional[str], Optional[Callable[[int, Optional[int], float], None]], Optional[Any]) -> ConversionFuture
+        """
+         Awaitable convert(), run in executor (the loop default executor when None).
+         Cancelling the returned future, or a task awaiting it, stops conversion at the next read
+         of sheet data, both are cancelled once the conversion thread has stopped and closed
+         outfile, so asyncio.wait_for() raises TimeoutError only after that.
+         Sheets are converted in turn, worker processes are not forked from the executor thread,
+         so a converter with jobs > 1 raises XlsxValueError.
+        """
+        if self.options['jobs'] > 1:
+            raise XlsxValueError("aconvert does not convert sheets in parallel, use jobs=1")
+        loop = _get_event_loop()
+        cancel = threading.Event()
+        future = ConversionFuture(cancel, loop)
+        thread = loop.run_in_executor(executor, functools.partial(self.convert, outfile, sheetid, sheetname,
+                                                                  progress, cancel))
+        thread.add_done_callback(future.thread_done)
+        return future
+
+    def iter_column_batches(self, sheetid=1, sheetname=None, batch_rows=65536):
+        # type: (int, Optional[str], int) -> Iterator[Dict[int, Any]]
+        """Yield batches of up to batch_rows rows as dicts of column position -> column values
+
+        Numbers and date serials are kept as floats without number formats, columns holding only
+        floats come as float64 arrays with NaN for empty cells, other columns as object arrays with
+        None for empty cells. Without numpy array('d') and list objects are returned.
+        """
+        if sheetname:
+            sheetid = self.getSheetIdByName(sheetname)
+            if not sheetid:
+                raise XlsxException("Sheet '%s' not found" % sheetname)
+        sheet = self._open_sheet(sheetid)
+        sheet.set_values("serial")
+        buffer = ColumnBuffer()
+        try:
+            for row in sheet.iter_rows():
+                buffer.writerow(row)
+                if buffer.rows >= batch_rows:
+                    yield buffer.take()
+            if buffer.rows:
+                yield buffer.take()
+        finally:
+            sheet.close()
+
+    def _convert(self, sheet_index, outfile, progress=None, cancel=None):
         closefile = False
         if isinstance(outfile, str):
             if sys.version_info[0] == 2:
-                outfile = open(outfile, 'wb+')
+                outfile = open(outfile, 'wb+', self.options['write_buffer'])
             elif sys.version_info[0] == 3:
-                outfile = open(outfile, 'w+', encoding=self.options['outputencoding'], newline="")
+                outfile = open(outfile, 'w+', self.options['write_buffer'], encoding=self.options['outputencoding'],
+                               newline="")
             else:
                 raise XlsxException("error: version of your Python is not supported: " + str(sys.version_info) + "\n")
             closefile = True
@@ -361,83 +735,124 @@ class Xlsx2csv:
         try:
             writer = csv.writer(outfile, quoting=self.options['quoting'], delimiter=self.options['delimiter'],
                                 lineterminator=self.options['lineterminator'])
-
-            sheets_filtered = list(filter(lambda s: s['index'] == sheet_index, self.workbook.sheets))
-            if len(sheets_filtered) == 0:
-                raise XlsxValueError("Sheet with index %i not found or can't be handled" % sheet_index)
-
-            sheet_path = None
-            # using sheet relation information
-            if 'relation_id' in sheets_filtered[0] and sheets_filtered[0]['relation_id'] is not None:
-
-                relation_id = sheets_filtered[0]['relation_id']
-                if relation_id in self.workbook.relationships.relationships and \
-                                'target' in self.workbook.relationships.relationships[relation_id]:
-                    relationship = self.workbook.relationships.relationships[relation_id]
-                    sheet_path = relationship['target']
-                    if not (sheet_path.startswith("/xl/") or sheet_path.startswith("xl/")):
-                        sheet_path = "/xl/" + sheet_path
-
-            sheet_file = None
-            if sheet_path is None:
-                sheet_path = "/xl/worksheets/sheet%i.xml" % sheet_index
-                sheet_file = self._filehandle(sheet_path)
-                if sheet_file is None:
-                    sheet_path = None
-            if sheet_path is None:
-                sheet_path = "/xl/worksheets/worksheet%i.xml" % sheet_index
-                sheet_file = self._filehandle(sheet_path)
-                if sheet_file is None:
-                    sheet_path = None
-            if sheet_path is None and sheet_index == 1:
-                sheet_path = self.content_types.types["worksheet"]
-                sheet_file = self._filehandle(sheet_path)
-                if sheet_file is None:
-                    sheet_path = None
-            if sheet_file is None and sheet_path is not None:
-                sheet_file = self._filehandle(sheet_path)
-            if sheet_file is None:
-                raise SheetNotFoundException("Sheet %i not found" % sheet_index)
-            sheet = Sheet(self.workbook, self.shared_strings, self.styles, sheet_file)
+            started = self.stats and self.stats.start()
+            sheet = self._open_sheet(sheet_index, progress, cancel)
             try:
-                relationships_path = os.path.join(os.path.dirname(sheet_path),
-                                                  "_rels",
-                                                  os.path.basename(sheet_path) + ".rels")
-                sheet.relationships = self._parse(Relationships, relationships_path)
-                sheet.set_dateformat(self.options['dateformat'])
-                sheet.set_timeformat(self.options['timeformat'])
-                sheet.set_floatformat(self.options['floatformat'])
-                sheet.set_skip_empty_lines(self.options['skip_empty_lines'])
-                sheet.set_skip_trailing_columns(self.options['skip_trailing_columns'])
-                sheet.set_include_hyperlinks(self.options['hyperlinks'])
-                sheet.set_merge_cells(self.options['merge_cells'])
-                sheet.set_scifloat(self.options['scifloat'])
-                sheet.set_ignore_formats(self.options['ignore_formats'])
-                sheet.set_skip_hidden_rows(self.options['skip_hidden_rows'])
-                sheet.set_no_line_breaks(self.options['no_line_breaks'])
-                sheet.set_ignore_percentage(self.options['ignore_percentage'])
-                if self.options['escape_strings'] and sheet.filedata:
-                    sheet.filedata = re.sub(r"(<v>[^<>]+)&#10;([^<>]+</v>)", r"\1\\n\2",
-                                            re.sub(r"(<v>[^<>]+)&#9;([^<>]+</v>)", r"\1\\t\2",
-                                                   re.sub(r"(<v>[^<>]+)&#13;([^<>]+</v>)", r"\1\\r\2", sheet.filedata.decode())))
                 sheet.to_csv(writer)
             finally:
-                sheet_file.close()
                 sheet.close()
+                if self.stats:
+                    self.stats.stop("sheets", started)
+                    self.stats.count("rows", sheet.rowsWritten)
         finally:
             if closefile:
                 outfile.close()
 
-    def _filehandle(self, filename):
-        for name in filter(lambda f: filename and f.lower() == filename.lower()[1:], self.ziphandle.namelist()):
-            # python2.4 fix
-            if not hasattr(self.ziphandle, "open"):
-                return StringIO(self.ziphandle.read(name))
-            return self.ziphandle.open(name, "r")
-        return None
+    def _sheet_parts(self, sheet_index):
+        # type: (int) -> Optional[Tuple[str, str]]
+        """Part and relationships paths of the sheet, resolved for all workbook sheets on first use"""
+        if self._sheet_paths is None:
+            # filled before it is shared, threads opening their first sheets at once may both resolve it
+            sheet_paths = {}
+            for s in self.workbook.sheets:
+                if s['index'] not in sheet_paths:
+                    sheet_paths[s['index']] = self._resolve_sheet_parts(s)
+            self._sheet_paths = sheet_paths
+        if sheet_index not in self._sheet_paths:
+            raise XlsxValueError("Sheet with index %i not found or can't be handled" % sheet_index)
+        return self._sheet_paths[sheet_index]
+
+    def _resolve_sheet_parts(self, sheet):
+        sheet_index = sheet['index']
+        sheet_path = None
+        # using sheet relation information
+        if 'relation_id' in sheet and sheet['relation_id'] is not None:
+
+            relation_id = sheet['relation_id']
+            if relation_id in self.workbook.relationships.relationships and \
+                            'target' in self.workbook.relationships.relationships[relation_id]:
+                relationship = self.workbook.relationships.relationships[relation_id]
+                sheet_path = relationship['target']
+                if not (sheet_path.startswith("/xl/") or sheet_path.startswith("xl/")):
+                    sheet_path = "/xl/" + sheet_path
+
+        if sheet_path is None:
+            candidates = ["/xl/worksheets/sheet%i.xml" % sheet_index, "/xl/worksheets/worksheet%i.xml" % sheet_index]
+            if sheet_index == 1:
+                candidates.append(self.content_types.types["worksheet"])
+            for candidate in candidates:
+                if self._member(candidate) is not None:
+                    sheet_path = candidate
+                    break
+        if sheet_path is None or self._member(sheet_path) is None:
+            return None
+        relationships_path = os.path.join(os.path.dirname(sheet_path),
+                                          "_rels",
+                                          os.path.basename(sheet_path) + ".rels")
+        return sheet_path, relationships_path
+
+    def _open_sheet(self, sheet_index, progress=None, cancel=None):
+        parts = self._sheet_parts(sheet_index)
+        if parts is None:
+            raise SheetNotFoundException("Sheet %i not found" % sheet_index)
+        sheet_path, relationships_path = parts
+        sheet_file = self._filehandle(sheet_path)
+        # shared strings are loaded by the sheet only when it meets the first shared string cell
+        sheet = Sheet(self.workbook, self._shared_strings, self.styles, sheet_file)
+        sheet.set_filehandle_opener(lambda: self._filehandle(sheet_path))
+        sheet.set_shared_strings_loader(lambda: self.shared_strings)
+        try:
+            sheet.relationships = self._parse(Relationships, relationships_path)
+            sheet.set_dateformat(self.options['dateformat'])
+            sheet.set_timeformat(self.options['timeformat'])
+            sheet.set_floatformat(self.options['floatformat'])
+            sheet.set_skip_empty_lines(self.options['skip_empty_lines'])
+            sheet.set_skip_trailing_columns(self.options['skip_trailing_columns'])
+            sheet.set_include_hyperlinks(self.options['hyperlinks'])
+            sheet.set_merge_cells(self.options['merge_cells'])
+            sheet.set_scifloat(self.options['scifloat'])
+            sheet.set_ignore_formats(self.options['ignore_formats'])
+            sheet.set_skip_hidden_rows(self.options['skip_hidden_rows'])
+            sheet.set_no_line_breaks(self.options['no_line_breaks'])
+            sheet.set_ignore_percentage(self.options['ignore_percentage'])
+            sheet.set_ignore_invalid_char_data(self.options['ignore_invalid_char_data'])
+            sheet.set_escape_strings(self.options['escape_strings'])
+            sheet.set_columns(self._columns)
+            sheet.set_values(self.options['values'])
+            sheet.set_stats(self.stats)
+            sheet.set_read_ahead(self.options['read_ahead'], self.options['read_chunk_size'])
+            sheet.set_write_batch(self.options['write_batch'], self.options['write_behind'])
+            if cancel is not None:
+                sheet.set_cancel(cancel)
+            if progress is not None:
+                sheet.set_progress(progress, self.options['progress_every'],
+                                   self.ziphandle.getinfo(self._member(sheet_path)).file_size)
+            if self._rows:
+                sheet.set_rows(*self._rows)
+            sheet.set_max_rows(self.options['max_rows'])
+        except:
+            sheet.close()
+            raise
+        return sheet
+
+    def _member(self, filename):
+        # type: (Optional[str]) -> Optional[str]
+        """Zip member name for the part path, matched case-insensitively"""
+        if not filename:
+            return None
+        return self.members.get(filename.lower()[1:])
 
-    def _parse(self, klass, filename):
-        instance = klass()
+    def _filehandle(self, filename):
+        name = self._member(filename)
+        if name is None:
+            return None
+        # python2.4 fix
+        if not hasattr(self.ziphandle, "open"):
+            return StringIO(self.ziphandle.read(name))
+        return self.ziphandle.open(name, "r")
+
+    def _parse(self, klass, filename, *args):
+        instance = klass(*args)
         filehandle = self._filehandle(filename)
         if filehandle:
             instance.parse(filehandle)
@@ -445,72 +860,396 @@ class Xlsx2csv:
         return instance
 
 
-class Workbook:
+class Stats:
+    """
+     Wall and cpu seconds of conversion phases and counters of hot path events.
+     Phases nest: "sheets" includes "inflate", "format" and "write", which are measured
+     in wall time only, and shared strings when the first sheet loads them. Stats of
+     parallel workers are summed up.
+    """
+
     def __init__(self):
-        self.sheets = list()
-        self.date1904 = False
+        self.phases = {}
+        self.counters = {}
+
+    def start(self):
+        return perf_counter(), process_time()
+
+    def stop(self, name, started):
+        self.add(name, perf_counter() - started[0], process_time() - started[1])
+
+    def add(self, name, wall, cpu=None):
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = [0.0, None]
+        phase[0] += wall
+        if cpu is not None:
+            phase[1] = (phase[1] or 0.0) + cpu
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, other):
+        # type: (Dict[str, Any]) -> None
+        """Add stats given as returned by as_dict()"""
+        for name, phase in other['phases'].items():
+            self.add(name, phase['wall'], phase['cpu'])
+        for name, n in other['counters'].items():
+            self.count(name, n)
+
+    def as_dict(self):
+        # type: () -> Dict[str, Any]
+        return {
+            'phases': dict((name, {'wall': wall, 'cpu': cpu}) for name, (wall, cpu) in self.phases.items()),
+            'counters': dict(self.counters),
+        }
+
+
+class TimedReader:
+    """File wrapper adding time spent in read() to the "inflate" phase"""
+    def __init__(self, filehandle, stats):
+        self.filehandle = filehandle
+        self.stats = stats
 
-    def parse(self, filehandle):
-        workbookDoc = minidom.parseString(filehandle.read())
-        if workbookDoc.firstChild.namespaceURI:
-            fileVersion = workbookDoc.firstChild.getElementsByTagNameNS(workbookDoc.firstChild.namespaceURI,
-                                                                        "fileVersion")
-        else:
-            fileVersion = workbookDoc.firstChild.getElementsByTagName("fileVersion")
-        if len(fileVersion) == 0:
-            self.appName = DEFAULT_APP_PATH
-        else:
-            try:
-                if workbookDoc.firstChild.namespaceURI:
-                    self.appName = \
-                        workbookDoc.firstChild.getElementsByTagNameNS(
-                            workbookDoc.firstChild.namespaceURI, "fileVersion")[0]._attrs['appName'].value
+    def read(self, size=-1):
+        started = perf_counter()
+        data = self.filehandle.read(size)
+        self.stats.add("inflate", perf_counter() - started)
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self.filehandle, name)
+
+
+class CancellableReader:
+    """File wrapper raising ConversionCancelled from read() once the cancel event is set"""
+    def __init__(self, filehandle, cancel):
+        self.filehandle = filehandle
+        self.cancel = cancel
+
+    def read(self, size=-1):
+        if self.cancel.is_set():
+            raise ConversionCancelled("Conversion cancelled")
+        return self.filehandle.read(size)
+
+    def __getattr__(self, name):
+        return getattr(self.filehandle, name)
+
+
+def _get_event_loop():
+    # get_running_loop is python3.7+
+    return getattr(asyncio, "get_running_loop", asyncio.get_event_loop)()
+
+
+if asyncio is not None:
+    class ConversionFuture(asyncio.Future):
+        """
+         Future of Xlsx2csv.aconvert. cancel() asks the conversion thread to stop, the future is
+         cancelled once the thread has stopped, as an awaiting task would be.
+        """
+        def __init__(self, cancel, loop):
+            asyncio.Future.__init__(self, loop=loop)
+            self.cancel_event = cancel
+            self.cancel_args = None
+
+        def cancel(self, *args, **kwargs):
+            if self.done():
+                return False
+            self.cancel_event.set()
+            self.cancel_args = (args, kwargs)
+            return True
+
+        def thread_done(self, thread):
+            if thread.cancelled() or isinstance(thread.exception(), ConversionCancelled):
+                if self.cancel_args is not None:
+                    args, kwargs = self.cancel_args
+                    asyncio.Future.cancel(self, *args, **kwargs)
                 else:
-                    self.appName = workbookDoc.firstChild.getElementsByTagName("fileVersion")[0]._attrs['appName'].value
-            except KeyError:
-                # no app name
-                self.appName = DEFAULT_APP_PATH
-        try:
-            if workbookDoc.firstChild.namespaceURI:
-                self.date1904 = \
-                    workbookDoc.firstChild.getElementsByTagNameNS(
-                        workbookDoc.firstChild.namespaceURI, "workbookPr")[0]._attrs['date1904'].value.lower().strip() \
-                    != "false"
+                    self.set_exception(ConversionCancelled("Conversion cancelled"))
+            elif thread.exception() is not None:
+                self.set_exception(thread.exception())
             else:
-                self.date1904 = \
-                    workbookDoc.firstChild.getElementsByTagName("workbookPr")[0] \
-                        ._attrs['date1904'].value.lower().strip() \
-                    != "false"
-        except:
+                self.set_result(thread.result())
+
+
+def _read_rows(rows, cancel, batch_rows, queue, loop):
+    # runs in the executor for AsyncRows, None marks the end of rows
+    batch = []
+    try:
+        try:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_rows:
+                    _put_rows(batch, cancel, queue, loop)
+                    batch = []
+            if batch:
+                _put_rows(batch, cancel, queue, loop)
+            _put_rows(None, cancel, queue, loop)
+        except ConversionCancelled:
             pass
+        except Exception as e:
+            try:
+                _put_rows(e, cancel, queue, loop)
+            except ConversionCancelled:
+                pass
+    finally:
+        # closes the sheet in this thread
+        rows.close()
+
+
+def _put_rows(item, cancel, queue, loop):
+    # waits for room in the queue, a cancelled reader drops its items. The put is not given up
+    # on timeout, which could lose or repeat an item, only once cancel is set or the loop is gone;
+    # asyncio.run() cancels a put left waiting by a consumer that stopped iterating.
+    if cancel.is_set():
+        raise ConversionCancelled("Conversion cancelled")
+    try:
+        put = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+    except RuntimeError:
+        # loop closed
+        raise ConversionCancelled("Conversion cancelled")
+    while True:
+        try:
+            put.result(ASYNC_PUT_WAIT)
+            return
+        except FutureTimeoutError:
+            if cancel.is_set() or loop.is_closed():
+                put.cancel()
+                raise ConversionCancelled("Conversion cancelled")
+        except FutureCancelledError:
+            raise ConversionCancelled("Conversion cancelled")
+
 
-        if workbookDoc.firstChild.namespaceURI:
-            sheets = workbookDoc.firstChild.getElementsByTagNameNS(workbookDoc.firstChild.namespaceURI, "sheets")[0]
+class AsyncRows:
+    """
+     Async iterator handing out rows read by a generator in an executor, see Xlsx2csv.aiter_rows.
+     Written with plain futures instead of async syntax, which older pythons do not parse.
+    """
+    def __init__(self, rows, cancel, batch_rows, queue_size, executor=None):
+        self.rows = rows
+        self.cancel = cancel
+        self.batch_rows = batch_rows
+        self.queue_size = queue_size
+        self.executor = executor
+        self.loop = None
+        self.queue = None
+        self.future = None
+        self.batch = []
+        self.position = 0
+        self.finished = False
+
+    def __aiter__(self):
+        return self
+
+    def __aenter__(self):
+        future = _get_event_loop().create_future()
+        future.set_result(self)
+        return future
+
+    def __aexit__(self, exc_type, exc_val, exc_tb):
+        return self.aclose()
+
+    def _start(self):
+        self.loop = _get_event_loop()
+        self.queue = asyncio.Queue(self.queue_size)
+        self.future = self.loop.run_in_executor(self.executor, functools.partial(
+            _read_rows, self.rows, self.cancel, self.batch_rows, self.queue, self.loop))
+
+    def __anext__(self):
+        if self.future is None:
+            self._start()
+        result = self.loop.create_future()
+        if self.position < len(self.batch):
+            result.set_result(self.batch[self.position])
+            self.position += 1
+        elif self.finished:
+            result.set_exception(StopAsyncIteration())
         else:
-            sheets = workbookDoc.firstChild.getElementsByTagName("sheets")[0]
-        if workbookDoc.firstChild.namespaceURI:
-            sheetNodes = sheets.getElementsByTagNameNS(workbookDoc.firstChild.namespaceURI, "sheet")
+            get = asyncio.ensure_future(self.queue.get())
+
+            def got(get):
+                if result.cancelled() or get.cancelled():
+                    return
+                item = get.result()
+                if item is None:
+                    self.finished = True
+                    result.set_exception(StopAsyncIteration())
+                elif isinstance(item, Exception):
+                    self.finished = True
+                    result.set_exception(item)
+                else:
+                    self.batch, self.position = item, 1
+                    result.set_result(item[0])
+
+            def cancelled(result):
+                if result.cancelled():
+                    get.cancel()
+                    self._stop()
+            get.add_done_callback(got)
+            result.add_done_callback(cancelled)
+        return result
+
+    def _stop(self):
+        # a reader waiting for room gets it and sees the cancel event before its next put
+        self.finished = True
+        self.cancel.set()
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    def __del__(self):
+        # an iteration left without aclose() stops its reader, which holds no reference to self
+        if self.future is not None and not self.future.done():
+            self.cancel.set()
+
+    def aclose(self):
+        """Stop reading, the returned awaitable is done once the sheet is closed"""
+        if self.future is None:
+            self.finished = True
+            self.rows.close()
+            future = _get_event_loop().create_future()
+            future.set_result(None)
+            return future
+        if not self.future.done():
+            self._stop()
+        return self.future
+
+
+class TimedWriter:
+    """csv writer wrapper adding time spent in writerow() and writerows() to the "write" phase"""
+    def __init__(self, writer, stats):
+        self.writer = writer
+        self.stats = stats
+
+    def writerow(self, row):
+        started = perf_counter()
+        self.writer.writerow(row)
+        self.stats.add("write", perf_counter() - started)
+
+    def writerows(self, rows):
+        started = perf_counter()
+        self.writer.writerows(rows)
+        self.stats.add("write", perf_counter() - started)
+
+
+class BatchWriter:
+    """
+     csv writer stand-in passing rows on to writerows() in blocks of batch_rows. With queue_size
+     the blocks are written by a background thread from a queue of that many blocks, so parsing
+     waits for the output only when the queue is full; that wait is the "write_wait" phase.
+    """
+    def __init__(self, writer, batch_rows, queue_size=0, stats=None):
+        self.writer = writer
+        self.batch_rows = batch_rows
+        self.stats = stats
+        self.rows = []
+        self.error = None
+        self.thread = None
+        if queue_size:
+            self.queue = queue.Queue(queue_size)
+            self.thread = threading.Thread(target=self._write_behind)
+            self.thread.daemon = True
+            self.thread.start()
+
+    def writerow(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        rows, self.rows = self.rows, []
+        if not rows:
+            return
+        if self.thread is None:
+            self.writer.writerows(rows)
+            return
+        if self.error is not None:
+            raise self.error
+        if self.stats:
+            started = perf_counter()
+            self.queue.put(rows)
+            self.stats.add("write_wait", perf_counter() - started)
         else:
-            sheetNodes = sheets.getElementsByTagName("sheet")
-        for i, sheetNode in enumerate(sheetNodes):
-            attrs = sheetNode._attrs
-            name = attrs["name"].value
-            state = None
-            if 'state' in attrs:
-                state = attrs["state"].value
-            relation_id = None
-            if 'r:id' in attrs:
-                relation_id = attrs['r:id'].value
+            self.queue.put(rows)
+
+    def _write_behind(self):
+        while True:
+            rows = self.queue.get()
+            if rows is None:
+                return
+            # after an error blocks are still taken off the queue, so flush() never blocks on it
+            if self.error is None:
+                try:
+                    self.writer.writerows(rows)
+                except Exception as e:
+                    self.error = e
+
+    def close(self):
+        # type: () -> None
+        """Write pending rows and wait for the write-behind thread to finish"""
+        try:
+            self.flush()
+        finally:
+            if self.thread is not None:
+                self.queue.put(None)
+                self.thread.join()
+                self.thread = None
+        if self.error is not None:
+            raise self.error
+
+
+class Workbook:
+    def __init__(self):
+        self.sheets = list()
+        self.date1904 = False
+        self.appName = DEFAULT_APP_PATH
+        self.fileVersion = False
+        self.workbookPr = False
+        self.in_sheets = False
+        self.sheetsDone = False
+
+    def parse(self, filehandle):
+        parser = xml.parsers.expat.ParserCreate()
+        parser.StartElementHandler = self.handleStartElement
+        parser.EndElementHandler = self.handleEndElement
+        parser.ParseFile(filehandle)
+
+    def handleStartElement(self, name, attrs):
+        # ignore namespace
+        i = name.find(":")
+        if i >= 0:
+            name = name[i + 1:]
+
+        if name == 'fileVersion' and not self.fileVersion:
+            self.fileVersion = True
+            self.appName = attrs.get('appName', DEFAULT_APP_PATH)
+        elif name == 'workbookPr' and not self.workbookPr:
+            self.workbookPr = True
+            if 'date1904' in attrs:
+                self.date1904 = attrs['date1904'].lower().strip() != "false"
+        elif name == 'sheets' and not self.sheetsDone:
+            self.in_sheets = True
+        elif name == 'sheet' and self.in_sheets:
             self.sheets.append(
                 {
-                    'name': name,
-                    'relation_id': relation_id,
-                    'index': i + 1,
-                    'id': i + 1, # remove id starting 0.8.0 version
-                    'state': state
+                    'name': attrs["name"],
+                    'relation_id': attrs.get('r:id'),
+                    'index': len(self.sheets) + 1,
+                    'id': len(self.sheets) + 1, # remove id starting 0.8.0 version
+                    'state': attrs.get('state')
                 }
             )
 
+    def handleEndElement(self, name):
+        # ignore namespace
+        i = name.find(":")
+        if i >= 0:
+            name = name[i + 1:]
+
+        if name == 'sheets' and self.in_sheets:
+            # only sheets of the first <sheets> element are used
+            self.in_sheets = False
+            self.sheetsDone = True
+
 
 class ContentTypes:
     def __init__(self):
@@ -519,30 +1258,9 @@ class ContentTypes:
             self.types[type] = None
 
     def parse(self, filehandle):
-        types = minidom.parseString(filehandle.read()).firstChild
-        if not types:
-            return
-        if types.namespaceURI:
-            overrideNodes = types.getElementsByTagNameNS(types.namespaceURI, "Override")
-        else:
-            overrideNodes = types.getElementsByTagName("Override")
-        for override in overrideNodes:
-            attrs = override._attrs
-            type = attrs.get('ContentType').value
-            name = attrs.get('PartName').value
-            if type == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml":
-                self.types["workbook"] = name
-            elif type == "application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml":
-                self.types["styles"] = name
-            elif type == "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml":
-                # BUG preserved only last sheet
-                self.types["worksheet"] = name
-            elif type == "application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml":
-                self.types["shared_strings"] = name
-            elif type == "application/vnd.openxmlformats-package.relationships+xml":
-                if self.types["relationships"] is None:
-                    self.types["relationships"] = list()
-                self.types["relationships"].append(name)
+        parser = xml.parsers.expat.ParserCreate()
+        parser.StartElementHandler = self.handleStartElement
+        parser.ParseFile(filehandle)
 
         if self.types["workbook"] is None:
             self.types["workbook"] = DEFAULT_WORKBOOK_PATH
@@ -550,70 +1268,151 @@ class ContentTypes:
             self.types["relationships"] = [os.path.dirname(self.types["workbook"]) + "/_rels/" + \
                                            os.path.basename(self.types["workbook"]) + ".rels"]
 
+    def handleStartElement(self, name, attrs):
+        if not (name == 'Override' or name.endswith(':Override')):
+            return
+        type = attrs.get('ContentType')
+        name = attrs.get('PartName')
+        if type == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml":
+            self.types["workbook"] = name
+        elif type == "application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml":
+            self.types["styles"] = name
+        elif type == "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml":
+            # BUG preserved only last sheet
+            self.types["worksheet"] = name
+        elif type == "application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml":
+            self.types["shared_strings"] = name
+        elif type == "application/vnd.openxmlformats-package.relationships+xml":
+            if self.types["relationships"] is None:
+                self.types["relationships"] = list()
+            self.types["relationships"].append(name)
+
 
 class Relationships:
     def __init__(self):
         self.relationships = {}
+        self.in_relationships = False
+        self.relationshipsDone = False
 
     def parse(self, filehandle):
-        doc = minidom.parseString(filehandle.read())
-        if doc.namespaceURI:
-            relationships = doc.getElementsByTagNameNS(doc.namespaceURI, "Relationships")
-        else:
-            relationships = doc.getElementsByTagName("Relationships")
-        if not relationships:
-            return
-        if doc.namespaceURI:
-            relationshipNodes = relationships[0].getElementsByTagNameNS(doc.namespaceURI, "Relationship")
-        else:
-            relationshipNodes = relationships[0].getElementsByTagName("Relationship")
-        for rel in relationshipNodes:
-            attrs = rel._attrs
+        parser = xml.parsers.expat.ParserCreate()
+        parser.StartElementHandler = self.handleStartElement
+        parser.EndElementHandler = self.handleEndElement
+        parser.ParseFile(filehandle)
+
+    def handleStartElement(self, name, attrs):
+        # ignore namespace
+        i = name.find(":")
+        if i >= 0:
+            name = name[i + 1:]
+
+        if name == 'Relationships' and not self.relationshipsDone:
+            self.in_relationships = True
+        elif name == 'Relationship' and self.in_relationships:
             rId = attrs.get('Id')
             if rId:
-                vtype = attrs.get('Type')
-                target = attrs.get('Target')
-                self.relationships[str(rId.value)] = {
-                    "type": vtype and str(vtype.value) or None,
-                    "target": target and str(target.value) or None
+                self.relationships[str(rId)] = {
+                    "type": attrs.get('Type') or None,
+                    "target": attrs.get('Target') or None
                 }
 
+    def handleEndElement(self, name):
+        # ignore namespace
+        i = name.find(":")
+        if i >= 0:
+            name = name[i + 1:]
+
+        if name == 'Relationships' and self.in_relationships:
+            self.in_relationships = False
+            self.relationshipsDone = True
+
+
+class SheetDimension:
+    def __init__(self):
+        self.ref = None
+        self.done = False
+
+    def parse(self, filehandle):
+        # <dimension> precedes <sheetData>, reading stops at whichever of them comes first
+        parser = xml.parsers.expat.ParserCreate()
+        parser.StartElementHandler = self.handleStartElement
+        while not self.done:
+            chunk = filehandle.read(SHEET_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            parser.Parse(chunk, False)
+        return self.ref
+
+    def handleStartElement(self, name, attrs):
+        # ignore namespace
+        i = name.find(":")
+        if i >= 0:
+            name = name[i + 1:]
+
+        if self.done:
+            return
+        if name == 'dimension':
+            self.ref = attrs.get('ref')
+            self.done = True
+        elif name == 'sheetData':
+            self.done = True
+
 
 class Styles:
     def __init__(self):
         self.numFmts = {}
         self.cellXfs = []
+        self.cellFormats = {}
+        self.depth = 0
+        # depth of the open <numFmts> and <cellXfs> elements, their direct children are collected
+        self.numFmtsDepth = None
+        self.cellXfsDepth = None
+        self.numFmtsCount = 0
+        self.cellXfsCount = 0
 
     def parse(self, filehandle):
-        styles = minidom.parseString(filehandle.read()).firstChild
-        # numFmts
-        if styles.namespaceURI:
-            numFmtsElement = styles.getElementsByTagNameNS(styles.namespaceURI, "numFmts")
-        else:
-            numFmtsElement = styles.getElementsByTagName("numFmts")
-        if len(numFmtsElement) == 1:
-            for numFmt in numFmtsElement[0].childNodes:
-                if numFmt.nodeType == minidom.Node.ELEMENT_NODE:
-                    numFmtId = int(numFmt._attrs['numFmtId'].value)
-                    formatCode = numFmt._attrs['formatCode'].value.lower().replace('\\', '')
-                    self.numFmts[numFmtId] = formatCode
-
-        if styles.namespaceURI:
-            cellXfsElement = styles.getElementsByTagNameNS(styles.namespaceURI, "cellXfs")
-        else:
-            cellXfsElement = styles.getElementsByTagName("cellXfs")
-        if len(cellXfsElement) == 1:
-            for cellXfs in cellXfsElement[0].childNodes:
-                if cellXfs.nodeType != minidom.Node.ELEMENT_NODE or not (
-                                cellXfs.nodeName == "xf" or cellXfs.nodeName.endswith(":xf")):
-                    continue
-                if cellXfs._attrs and 'numFmtId' in cellXfs._attrs:
-                    numFmtId = int(cellXfs._attrs['numFmtId'].value)
-                    if self.chk_exists(numFmtId) == None:
-                        numFmtId = int(cellXfs._attrs.get('applyNumberFormat', 0))
-                    self.cellXfs.append(numFmtId)
-                else:
-                    self.cellXfs.append(None)
+        parser = xml.parsers.expat.ParserCreate()
+        parser.StartElementHandler = self.handleStartElement
+        parser.EndElementHandler = self.handleEndElement
+        parser.ParseFile(filehandle)
+        # formats are only used when the part has a single <numFmts> and <cellXfs> element
+        if self.numFmtsCount > 1:
+            self.numFmts = {}
+        if self.cellXfsCount > 1:
+            self.cellXfs = []
+
+    def handleStartElement(self, name, attrs):
+        # ignore namespace
+        i = name.find(":")
+        if i >= 0:
+            name = name[i + 1:]
+
+        self.depth += 1
+        if name == 'numFmts':
+            self.numFmtsCount += 1
+            self.numFmtsDepth = self.depth
+        elif name == 'cellXfs':
+            self.cellXfsCount += 1
+            self.cellXfsDepth = self.depth
+        elif self.numFmtsDepth is not None and self.depth == self.numFmtsDepth + 1:
+            numFmtId = int(attrs['numFmtId'])
+            formatCode = attrs['formatCode'].lower().replace('\\', '')
+            self.numFmts[numFmtId] = formatCode
+        elif self.cellXfsDepth is not None and self.depth == self.cellXfsDepth + 1 and name == 'xf':
+            if 'numFmtId' in attrs:
+                numFmtId = int(attrs['numFmtId'])
+                if self.chk_exists(numFmtId) == None:
+                    numFmtId = int(attrs.get('applyNumberFormat', 0))
+                self.cellXfs.append(numFmtId)
+            else:
+                self.cellXfs.append(None)
+
+    def handleEndElement(self, name):
+        if self.depth == self.numFmtsDepth:
+            self.numFmtsDepth = None
+        elif self.depth == self.cellXfsDepth:
+            self.cellXfsDepth = None
+        self.depth -= 1
 
     # When Unknown Numformat ID assign applyNumberFormat
     def chk_exists(self, numFmtId):
@@ -625,31 +1424,559 @@ class Styles:
             format_str = STANDARD_FORMATS[xfs_numfmt]
         return format_str
 
+    def get_cell_format(self, s):
+        # type: (int) -> CellFormat
+        """Number format of cellXfs entry s, compiled once and cached by style id"""
+        cell_format = self.cellFormats.get(s)
+        if cell_format is not None:
+            return cell_format
+
+        format_str = "general"
+        xfs_numfmt = None
+        if s < len(self.cellXfs):
+            xfs_numfmt = self.cellXfs[s]
+        if xfs_numfmt in self.numFmts:
+            format_str = self.numFmts[xfs_numfmt]
+        elif xfs_numfmt in STANDARD_FORMATS:
+            format_str = STANDARD_FORMATS[xfs_numfmt]
+
+        if not format_str:
+            raise XlsxValueError("unknown format %s at %d" % (format_str, xfs_numfmt))
+
+        cell_format = self.cellFormats[s] = CellFormat(format_str)
+        return cell_format
+
+
+DATE_VALUE_RE = re.compile(r"^\d+(\.\d+)?$")
+FLOAT_VALUE_RE = re.compile(r"^-?\d+(.\d+)?$")
+SCIFLOAT_VALUE_RE = re.compile(r"^-?\d+(.\d+)?([eE]-?\d+)?$")
+DATE_FORMAT_RE = re.compile(".*[hsmdyY]")
+ELAPSED_FORMAT_RE = re.compile(r".*\[.*[dmhys].*\]")
+LOCALE_FORMAT_RE = re.compile(r"\[\$\-[A-z0-9]*\]")
+
+
+class CellFormat:
+    """Number format string resolved to its format type and output patterns"""
+
+    def __init__(self, format_str):
+        self.format_str = format_str
+        self.format_type = FORMATS.get(format_str)
+        # unknown format that looks like a date, final type depends on the cell value
+        self.date_like = self.format_type is None and DATE_FORMAT_RE.match(format_str) is not None and \
+            ELAPSED_FORMAT_RE.match(format_str) is None
+
+        self.date_pattern = None
+        if self.format_type == 'date' or self.date_like:
+            # ignore ";@", don't know what does it mean right now
+            # ignore "[$-409], [$-f409], [$-16001]" and similar format codes
+            self.date_pattern = str(LOCALE_FORMAT_RE.sub("", format_str, count=1)
+                .replace(";@", "").replace("yyyy", "%Y").replace("yy", "%y")
+                .replace("hh:mm", "%H:%M").replace("h", "%I").replace("%H%H", "%H")
+                .replace("ss", "%S").replace("dddd", "d").replace("dd", "d").replace("d", "%d")
+                .replace("am/pm", "%p").replace("mmmm", "%B").replace("mmm", "%b")
+                .replace(":mm", ":%M").replace("m", "%m").replace("%m%m", "%m"))
+
+        # if cell is general, be aggressive about stripping any trailing 0s, decimal points, etc.
+        self.float_pattern = "%f"
+        self.float_strip = True
+        if format_str != 'general' and format_str[0:3] == '0.0':
+            decimals = len(format_str.split(".")[1])
+            if '%' in format_str:
+                decimals += 1
+            self.float_pattern = "%." + str(decimals) + "f"
+            self.float_strip = False
+
+        if format_str == "0.00%":
+            self.percentage_quant = Decimal("1.00")
+        else:
+            self.percentage_quant = Decimal("1")
+
+
+GENERAL_CELL_FORMAT = CellFormat("general")
+
+US_PER_DAY = 86400000000
+DATE_CACHE_SIZE = 65536
+STRFTIME_DIRECTIVE_RE = re.compile(r"%(.)")
+TWO_DIGITS = ["%02d" % i for i in range(100)]
+
+
+class DateConverter:
+    """
+     Converts Excel date serials to strings without building datetime objects.
+     Strftime patterns are parsed once into a template, serials are split into
+     date and time with integer arithmetic and results of whole day serials are
+     memoized, as date columns tend to repeat the same values.
+    """
+
+    def __init__(self, date1904):
+        if date1904:
+            self.epoch = datetime.date(1904, 1, 1).toordinal()
+        else:
+            self.epoch = datetime.date(1899, 12, 30).toordinal()
+        # locale dependent names, the same strftime would give
+        self.months = [datetime.date(2001, m, 1).strftime("%B") for m in range(1, 13)]
+        self.months_abbr = [datetime.date(2001, m, 1).strftime("%b") for m in range(1, 13)]
+        self.ampm = [datetime.time(h).strftime("%p") for h in (0, 12)]
+        self.day_fields = {}
+        self.second_fields = {}
+        self.day_datetimes = {}
+
+    def compile(self, pattern):
+        """Template for str.format over date and time fields, None if pattern needs strftime"""
+        fields = {'Y': '{0[0]}', 'y': '{0[1]}', 'm': '{0[2]}', 'd': '{0[3]}', 'B': '{0[4]}', 'b': '{0[5]}',
+                  'H': '{1[0]}', 'I': '{1[1]}', 'M': '{1[2]}', 'S': '{1[3]}', 'p': '{1[4]}', '%': '%'}
+        template = []
+        pos = 0
+        for m in STRFTIME_DIRECTIVE_RE.finditer(pattern):
+            if m.group(1) not in fields:
+                return None
+            template.append(pattern[pos:m.start()].replace("{", "{{").replace("}", "}}"))
+            template.append(fields[m.group(1)])
+            pos = m.end()
+        if "%" in pattern[pos:]:
+            return None
+        template.append(pattern[pos:].replace("{", "{{").replace("}", "}}"))
+        return "".join(template)
+
+    def split(self, data):
+        """Excel serial to (ordinal, seconds), rounded like datetime.timedelta(float(data))"""
+        if data.isdigit():
+            return self.epoch + int(data), 0
+        ordinal, us = self.split_us(data)
+        return ordinal, us // 1000000
+
+    def split_us(self, data):
+        """Excel serial to (ordinal, microseconds), rounded like datetime.timedelta(float(data))"""
+        frac, whole = math.modf(float(data))
+        frac_us, whole_us = math.modf(frac * US_PER_DAY)
+        total = int(whole) * US_PER_DAY + int(whole_us)
+        if frac_us:
+            rounded = round(frac_us)
+            if abs(rounded - frac_us) == 0.5:
+                # halfway, round to even like timedelta does
+                odd = total & 1
+                rounded = 2 * round((frac_us + odd) * 0.5) - odd
+            total += int(rounded)
+        days, us = divmod(total, US_PER_DAY)
+        return self.epoch + days, us
+
+    def datetime(self, data):
+        if data.isdigit():
+            value = self.day_datetimes.get(data)
+            if value is None:
+                if len(self.day_datetimes) >= DATE_CACHE_SIZE:
+                    self.day_datetimes.clear()
+                value = self.day_datetimes[data] = datetime.datetime.fromordinal(self.epoch + int(data))
+            return value
+        ordinal, us = self.split_us(data)
+        return datetime.datetime.fromordinal(ordinal) + datetime.timedelta(microseconds=us)
+
+    def date_fields(self, ordinal):
+        fields = self.day_fields.get(ordinal)
+        if fields is None:
+            date = datetime.date.fromordinal(ordinal)
+            if date.year < 1000:
+                # strftime does not pad years before 1000 the same way on every platform
+                return None
+            if len(self.day_fields) >= DATE_CACHE_SIZE:
+                self.day_fields.clear()
+            fields = self.day_fields[ordinal] = (str(date.year), TWO_DIGITS[date.year % 100],
+                                                 TWO_DIGITS[date.month], TWO_DIGITS[date.day],
+                                                 self.months[date.month - 1], self.months_abbr[date.month - 1])
+        return fields
+
+    def time_fields(self, seconds):
+        fields = self.second_fields.get(seconds)
+        if fields is None:
+            hour = seconds // 3600
+            fields = self.second_fields[seconds] = (TWO_DIGITS[hour], TWO_DIGITS[hour % 12 or 12],
+                                                    TWO_DIGITS[seconds // 60 % 60], TWO_DIGITS[seconds % 60],
+                                                    self.ampm[hour >= 12])
+        return fields
+
+    def format(self, data, pattern, template):
+        if template is not None:
+            ordinal, seconds = self.split(data)
+            fields = self.date_fields(ordinal)
+            if fields is not None:
+                return template.format(fields, self.time_fields(seconds))
+        # strftime gets microseconds for %f
+        ordinal, us = self.split_us(data)
+        date = datetime.datetime.fromordinal(ordinal) + datetime.timedelta(microseconds=us)
+        return date.strftime(pattern)
+
+
+class CellFormatter:
+    """
+     Output functions for cells of one style, bound to sheet options. Sheet compiles
+     one formatter per style id, so per cell work is a lookup and a call.
+    """
+
+    def __init__(self, cell_format, sheet):
+        self.format_str = cell_format.format_str
+        self.format_type = cell_format.format_type
+        self.date_like = cell_format.date_like
+        self.date_pattern = cell_format.date_pattern
+        self.float_pattern = cell_format.float_pattern
+        self.float_strip = cell_format.float_strip
+        self.percentage_quant = cell_format.percentage_quant
+
+        self.dateformat = sheet.dateformat and str(sheet.dateformat)
+        self.timeformat = sheet.timeformat
+        self.floatformat = sheet.floatformat and str(sheet.floatformat)
+        self.scifloat = sheet.scifloat
+        self.ignore_percentage = sheet.ignore_percentage
+
+        self.dates = sheet.dates
+        self.date_cache = {}
+        self.time_cache = {}
+        self.native_time_cache = {}
+        self.date_output = self.dateformat or self.date_pattern
+        self.date_template = self.date_output and self.dates.compile(self.date_output)
+
+        if self.format_type == 'date' and self.dateformat == 'float':
+            self.format_type = 'float'
+
+        self.outputs = {}
+        for format_type, output in (('date', self.format_date), ('time', self.format_time),
+                                    ('float', self.format_float), ('percentage', self.format_percentage)):
+            if format_type not in sheet.ignore_formats:
+                self.outputs[format_type] = output
+        # python values for values="native", ignored formats give the raw text like in outputs
+        self.natives = {}
+        for format_type, native in (('date', self.dates.datetime), ('time', self.native_time),
+                                    ('float', self.native_number), ('percentage', float)):
+            if format_type not in sheet.ignore_formats:
+                self.natives[format_type] = native
+        # numbers the general format does not recognize, like 1.5E-5 without scifloat
+        self.natives[None] = self.native_value
+
+    def get_type(self, data):
+        if self.format_type:
+            return self.format_type
+        if self.date_like and DATE_VALUE_RE.match(data):
+            # it must be date format
+            if float(data) < 1:
+                return "time"
+            if self.dateformat == 'float':
+                return "float"
+            return "date"
+        if FLOAT_VALUE_RE.match(data) or (self.scifloat and SCIFLOAT_VALUE_RE.match(data)):
+            return "float"
+        return None
+
+    def format_date(self, data):
+        value = self.date_cache.get(data)
+        if value is not None:
+            return value
+        value = self.dates.format(data, self.date_output, self.date_template)
+        if not self.dateformat:
+            value = value.strip()
+        if data.isdigit():
+            # only whole day serials are memoized, they repeat a lot in date columns
+            if len(self.date_cache) >= DATE_CACHE_SIZE:
+                self.date_cache.clear()
+            self.date_cache[data] = value
+        return value
+
+    def format_time(self, data):
+        t = int(round((float(data) % 1) * 24 * 60 * 60, 6))  # it should be in seconds
+        value = self.time_cache.get(t)
+        if value is None:
+            d = datetime.time(int((t // 3600) % 24), int((t // 60) % 60), int(t % 60))
+            value = self.time_cache[t] = d.strftime(self.timeformat)
+        return value
+
+    def native_time(self, data):
+        t = int(round((float(data) % 1) * 24 * 60 * 60, 6))
+        value = self.native_time_cache.get(t)
+        if value is None:
+            value = self.native_time_cache[t] = datetime.time(int((t // 3600) % 24), int((t // 60) % 60), int(t % 60))
+        return value
+
+    def native_number(self, data):
+        if data.isdigit() or (data[:1] == '-' and data[1:].isdigit()):
+            return int(data)
+        return float(data)
+
+    def native_value(self, data):
+        try:
+            return self.native_number(data)
+        except ValueError:
+            return data
+
+    def format_float(self, data):
+        value = float(data)
+        if not self.floatformat and value.is_integer():
+            # repr(float(...)) - workaround to correctly round precision for floats
+            # repr gives same result on python 2 and 3, while str is different on python 2
+            return "%i" % Decimal(repr(value))
+        elif self.floatformat:
+            return (self.floatformat % value).rstrip('0').rstrip('.')
+        elif 'E' in data or 'e' in data:
+            return ("%f" % value).rstrip('0').rstrip('.')
+        elif self.float_strip:
+            return (self.float_pattern % value).rstrip('0').rstrip('.')
+        return self.float_pattern % value
+
+    def format_percentage(self, data):
+        if self.ignore_percentage:
+            # When ignoring percentage formatting, output the raw decimal value
+            return ("%f" % float(data)).rstrip('0').rstrip('.')
+        # Always round .5 up, not to nearest even as round() does.
+        return str((Decimal(data) * 100).quantize(self.percentage_quant, rounding=ROUND_HALF_UP)) + "%"
+
+
+XMLPARSER_WINDOWS_NEWLINE_STR = "_x000D_\n"
+
+
+COLUMN_RANGE_RE = re.compile(r"^([A-Za-z]+)(?::([A-Za-z]+))?$")
+
+
+def parse_columns(columns):
+    # type: (Union[str, Sequence[Union[str, int]]]) -> List[int]
+    """
+     Column numbers, starting at 1, of a projection like "A,C:F", ["A", "C:F"] or [1, 3, 4],
+     in the given order
+    """
+    if isinstance(columns, str):
+        columns = columns.split(",")
+    numbers = []
+    for spec in columns:
+        if isinstance(spec, int) and not isinstance(spec, bool):
+            if spec < 1:
+                raise XlsxValueError("Invalid column number: " + str(spec))
+            if spec not in numbers:
+                numbers.append(spec)
+            continue
+        m = COLUMN_RANGE_RE.match(spec.strip()) if isinstance(spec, str) else None
+        if not m:
+            raise XlsxValueError("Invalid column range: " + str(spec))
+        start = end = 0
+        for i in m.group(1).upper(): start = start * 26 + ord(i) - 64
+        for i in (m.group(2) or m.group(1)).upper(): end = end * 26 + ord(i) - 64
+        step = 1 if end >= start else -1
+        for number in range(start, end + step, step):
+            if number not in numbers:
+                numbers.append(number)
+    return numbers
+
+
+def parse_rows(rows):
+    # type: (Union[str, Tuple[Optional[int], Optional[int]]]) -> Tuple[Optional[int], Optional[int]]
+    """First and last row number of a window like "10:20", "10:" or ":20", both ends included"""
+    if not isinstance(rows, str):
+        try:
+            start, end = rows
+        except (TypeError, ValueError):
+            raise XlsxValueError("Invalid rows range: " + str(rows))
+        for bound in (start, end):
+            if bound is not None and (not isinstance(bound, int) or isinstance(bound, bool)):
+                raise XlsxValueError("Invalid rows range: " + str(rows))
+    else:
+        bounds = rows.split(":")
+        if len(bounds) == 1:
+            bounds = bounds * 2
+        if len(bounds) != 2:
+            raise XlsxValueError("Invalid rows range: " + rows)
+        try:
+            start, end = [int(bound) if bound.strip() else None for bound in bounds]
+        except ValueError:
+            raise XlsxValueError("Invalid rows range: " + rows)
+    if (start is not None and start < 1) or (end is not None and end < (start or 1)):
+        raise XlsxValueError("Invalid rows range: " + str(rows))
+    return start, end
+
+
+def escape_string(value):
+    return value.replace("\r", "\\r").replace("\n", "\\n").replace("\t", "\\t")
+
+
+def replace_line_breaks(value):
+    return value.replace("\r", " ").replace("\n", " ").replace("\t", " ")
+
+
+class SpoolingReader:
+    """File wrapper copying everything read from filehandle into spool"""
+    def __init__(self, filehandle, spool):
+        self.filehandle = filehandle
+        self.spool = spool
+
+    def read(self, size=-1):
+        data = self.filehandle.read(size)
+        self.spool.write(data)
+        return data
+
+
+class PackedStrings:
+    """
+     Shared strings packed into one contiguous utf-8 buffer with an offsets table,
+     avoids per string object overhead of a list.
+    """
 
-class SharedStrings:
     def __init__(self):
+        self.buffer = bytearray()
+        self.offsets = array('Q', [0])
+
+    def append(self, value):
+        self.buffer += value.encode('utf-8')
+        self.offsets.append(len(self.buffer))
+
+    def transform(self, func):
+        strings = PackedStrings()
+        for i in range(0, len(self)):
+            strings.append(func(self[i]))
+        self.buffer = strings.buffer
+        self.offsets = strings.offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        return self.buffer[self.offsets[index]:self.offsets[index + 1]].decode('utf-8')
+
+
+class IndexedStrings:
+    """
+     Shared strings kept as raw xml in a temporary file, only byte offsets of <si>
+     elements are held in memory. Strings are decoded on lookup, recently used
+     ones are kept in a bounded cache.
+    """
+
+    def __init__(self, transforms, cache_size=SHARED_STRINGS_CACHE_SIZE):
+        self.starts = array('Q')
+        self.ends = array('Q')
+        self.closing = b"</si>"
+        self.transforms = transforms
+        self.spool = None
+        self.data = None
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+
+    def spooling_reader(self, filehandle):
+        self.spool = tempfile.TemporaryFile()
+        return SpoolingReader(filehandle, self.spool)
+
+    def seal(self):
+        self.spool.flush()
+        if self.spool.tell() > 0:
+            # mmap has no file position, so it is also safe to share with forked processes
+            self.data = mmap.mmap(self.spool.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def add(self, start, end):
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def close(self):
+        self.cache.clear()
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        value = self.cache.get(index)
+        if value is not None:
+            self.cache.move_to_end(index)
+            return value
+
+        start = self.starts[index]
+        end = self.ends[index]
+        value = ""
+        if end > start:
+            strings = SharedStrings()
+            strings.parser = xml.parsers.expat.ParserCreate()
+            strings.parser.CharacterDataHandler = strings.handleCharData
+            strings.parser.StartElementHandler = strings.handleStartElement
+            strings.parser.EndElementHandler = strings.handleEndElement
+            strings.parser.Parse(self.data[start:end] + self.closing, True)
+            value = strings.strings[0]
+        for transform in self.transforms:
+            value = transform(value)
+
+        self.cache[index] = value
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(False)
+        return value
+
+
+class SharedStrings:
+    def __init__(self, mode="list", cache_size=SHARED_STRINGS_CACHE_SIZE):
         self.parser = None
-        self.strings = []
+        self.mode = mode
+        self.transforms = []
+        if mode == "indexed":
+            self.strings = IndexedStrings(self.transforms, cache_size)
+        elif mode == "packed":
+            self.strings = PackedStrings()
+        else:
+            self.strings = []
         self.si = False
         self.t = False
         self.rPh = False
         self.value = ""
+        self.start = 0
 
     def parse(self, filehandle):
         self.parser = xml.parsers.expat.ParserCreate()
+        if self.mode == "indexed":
+            # only remember where each <si> starts and ends, text is decoded on lookup
+            self.parser.StartElementHandler = self.handleIndexStartElement
+            self.parser.EndElementHandler = self.handleIndexEndElement
+            self.parser.ParseFile(self.strings.spooling_reader(filehandle))
+            self.strings.seal()
+            return
         self.parser.CharacterDataHandler = self.handleCharData
         self.parser.buffer_text = True
         self.parser.StartElementHandler = self.handleStartElement
         self.parser.EndElementHandler = self.handleEndElement
         self.parser.ParseFile(filehandle)
 
+    def close(self):
+        if self.mode == "indexed":
+            self.strings.close()
+
     def escape_strings(self):
-        for i in range(0, len(self.strings)):
-            self.strings[i] = self.strings[i].replace("\r", "\\r").replace("\n", "\\n").replace("\t", "\\t")
+        self.add_transform(escape_string)
 
     def replace_line_breaks(self):
-        for i in range(0, len(self.strings)):
-            self.strings[i] = self.strings[i].replace("\r", " ").replace("\n", " ").replace("\t", " ")
+        self.add_transform(replace_line_breaks)
+
+    def add_transform(self, func):
+        # applied to strings already stored and to strings added later on
+        self.transforms.append(func)
+        if self.mode == "indexed":
+            self.strings.cache.clear()
+        elif self.mode == "packed":
+            self.strings.transform(func)
+        else:
+            for i in range(0, len(self.strings)):
+                self.strings[i] = func(self.strings[i])
+
+    def handleIndexStartElement(self, name, attrs):
+        if name == 'si' or name.endswith(':si'):
+            self.si = True
+            self.value = None
+            self.start = self.parser.CurrentByteIndex
+            self.strings.closing = ("</" + name + ">").encode('utf-8')
+        elif self.si:
+            self.value = ""
+
+    def handleIndexEndElement(self, name):
+        if name == 'si' or name.endswith(':si'):
+            self.si = False
+            if self.value is None:
+                # <si/> or <si></si>, nothing to decode
+                self.strings.add(self.start, self.start)
+            else:
+                self.strings.add(self.start, self.parser.CurrentByteIndex)
 
     def handleCharData(self, data):
         if self.t:
@@ -679,14 +2006,128 @@ class SharedStrings:
 
         if name == 'si':
             self.si = False
-            self.strings.append(self.value)
+            value = self.value
+            # Handle string data that has \r\n by changing the value that expat uses for the \r to an empty string.
+            # This happens a lot with older versions of excel, and the character conversion is happening inside expat.
+            if value.find(XMLPARSER_WINDOWS_NEWLINE_STR) > -1:
+                value = value.replace(XMLPARSER_WINDOWS_NEWLINE_STR, "\n")
+            for transform in self.transforms:
+                value = transform(value)
+            self.strings.append(value)
         elif name == 't':
             self.t = False
         elif name == 'rPh':
             self.rPh = False
 
 
-XMLPARSER_WINDOWS_NEWLINE_STR = "_x000D_\n"
+SHEET_READ_CHUNK_SIZE = 64 * 1024
+ROOT_ELEMENT_RE = re.compile(br"<([A-Za-z_][\w.:-]*)[\s/>]")
+PRESCAN_ELEMENT_RE = re.compile(br"<(?:[A-Za-z_][\w.-]*:)?(?:mergeCells|hyperlinks)[\s/>]")
+PRESCAN_OVERLAP = 256
+CELL_REF_RE = re.compile(r"^\$?([A-Z]+)\$?(\d+)$")
+
+
+class ReadAheadReader:
+    """
+     Reads a file in a background thread into a bounded queue of chunks, zlib releases the GIL
+     while inflating, so reading overlaps with parsing in the calling thread
+    """
+    def __init__(self, filehandle, chunk_size, depth):
+        self.queue = queue.Queue(depth)
+        self.stopped = False
+        self.thread = threading.Thread(target=self._read, args=(filehandle, chunk_size))
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _read(self, filehandle, chunk_size):
+        try:
+            while not self.stopped:
+                chunk = filehandle.read(chunk_size)
+                self.queue.put(chunk)
+                if not chunk:
+                    return
+        except Exception as e:
+            self.queue.put(e)
+
+    def chunks(self):
+        while True:
+            chunk = self.queue.get()
+            if isinstance(chunk, Exception):
+                raise chunk
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        # a reader blocked on the full queue gets room for its last chunk and sees the stop flag
+        self.stopped = True
+        try:
+            while True:
+                self.queue.get_nowait()
+        except queue.Empty:
+            pass
+        self.thread.join()
+
+
+class RowBuffer:
+    """csv writer stand-in collecting rows for Sheet.iter_rows"""
+    def __init__(self):
+        self.rows = []
+
+    def writerow(self, row):
+        self.rows.append(row)
+
+
+class ColumnBuffer:
+    """Row values collected into per-column buffers for Xlsx2csv.iter_column_batches
+
+    A column is kept in an array('d') while all of its values are floats, NaN marking missing cells,
+    and turns into a list with None for missing cells once it gets any other value.
+    """
+    def __init__(self):
+        self.columns = {}
+        self.rows = 0
+
+    def writerow(self, row):
+        rows = self.rows
+        for position, value in enumerate(row):
+            if value == "":
+                continue
+            column = self.columns.get(position)
+            if column is None:
+                column = self.columns[position] = array('d')
+            if len(column) < rows:
+                self._pad(column, rows)
+            if type(value) is float and type(column) is array:
+                column.append(value)
+                continue
+            if type(column) is array:
+                column = self.columns[position] = [None if math.isnan(v) else v for v in column]
+            column.append(value)
+        self.rows += 1
+
+    def _pad(self, column, rows):
+        if type(column) is array:
+            column.extend(array('d', [float('nan')]) * (rows - len(column)))
+        else:
+            column.extend([None] * (rows - len(column)))
+
+    def take(self):
+        # type: () -> Dict[int, Any]
+        """Columns collected so far as numpy arrays, when numpy is available, buffer is emptied"""
+        columns = {}
+        for position in sorted(self.columns):
+            column = self.columns[position]
+            self._pad(column, self.rows)
+            if numpy is not None:
+                if type(column) is array:
+                    column = numpy.frombuffer(column, dtype=numpy.float64)
+                else:
+                    column = numpy.array(column, dtype=object)
+            columns[position] = column
+        self.columns = {}
+        self.rows = 0
+        return columns
 
 
 class Sheet:
@@ -719,25 +2160,76 @@ class Sheet:
         self.skip_empty_lines = False
         self.skip_trailing_columns = False
 
-        self.filedata = None
         self.filehandle = filehandle
         self.workbook = workbook
-        self.sharedStrings = sharedString.strings
+        self.sharedStrings = None
+        if sharedString is not None:
+            self.sharedStrings = sharedString.strings
+        self.sharedStringsLoader = None
+        self.filehandleOpener = None
         self.styles = styles
 
         self.hyperlinks = {}
-        self.mergeCells = {}
+        self.mergeRanges = []
+        self.mergeActive = []
+        self.mergeNext = 0
+        self.prescanned = None
         self.ignore_formats = []
         self.skip_hidden_rows = False
         self.no_line_breaks = False
         self.ignore_percentage = False
+        self.ignore_invalid_char_data = False
+        self.escape_strings = False
+        self.projection = None
+        self.values = "formatted"
+        self.stats = None
+        self.progress = None
+        self.progressNext = None
+        self.read_ahead = 0
+        self.read_chunk_size = SHEET_READ_CHUNK_SIZE
+        self.reader = None
+        self.write_batch = 1
+        self.write_behind = 0
+        self.batchWriter = None
+        self.dimensionEndRow = None
+        self.startRow = None
+        self.endRow = None
+        self.max_rows = None
+        self.rowsWritten = 0
+        self.skipRow = False
+        self.formatters = {}
+        self.dates = DateConverter(workbook.date1904)
 
         self.colIndex = 0
         self.colNum = ""
+        self.col = 0
+        self.rowHasCells = False
+        self.has_value_text = False
 
     def close(self):
         # Make sure Worksheet is closed, parsers lib does not have a close() function, so simply delete it
         self.parser = None
+        if self.reader:
+            self.reader.close()
+            self.reader = None
+        if self.batchWriter:
+            # to_csv closes the writer when it finishes, one left here belongs to a failed conversion,
+            # whose error is the one to propagate
+            batchWriter, self.batchWriter = self.batchWriter, None
+            try:
+                batchWriter.close()
+            except Exception:
+                pass
+        if self.filehandle:
+            self.filehandle.close()
+            self.filehandle = None
+
+    def set_shared_strings_loader(self, loader):
+        self.sharedStringsLoader = loader
+
+    def set_filehandle_opener(self, opener):
+        # the pre-scan reads the sheet part from a handle of its own, zip members seek back only from python 3.7
+        self.filehandleOpener = opener
 
     def set_dateformat(self, dateformat):
         self.dateformat = dateformat
@@ -767,87 +2259,85 @@ class Sheet:
     def set_ignore_percentage(self, ignore_percentage):
         self.ignore_percentage = ignore_percentage
 
-    def set_merge_cells(self, mergecells):
-        if not mergecells:
-            return
-        if not self.filedata:
-            self.filedata = self.filehandle.read()
-        data = str(self.filedata)  # python3: convert byte buffer to string
+    def set_ignore_invalid_char_data(self, ignore_invalid_char_data):
+        self.ignore_invalid_char_data = ignore_invalid_char_data
 
-        # find worksheet tag, we need namespaces from it
-        start = data.find("<worksheet")
-        if start < 0:
-            return
-        end = data.find(">", start)
-        worksheet = data[start: end + 1]
+    def set_escape_strings(self, escape_strings):
+        self.escape_strings = escape_strings
 
-        # find hyperlinks part
-        start = data.find("<mergeCells")
-        if start < 0:
-            # hyperlinks not found
+    def set_merge_cells(self, mergecells):
+        if not mergecells:
             return
-        end = data.find("</mergeCells>")
-        data = data[start: end + 13]
-
-        # parse hyperlinks
-        doc = minidom.parseString(worksheet + data + "</worksheet>").firstChild
-
-        if doc.namespaceURI:
-            mergeCells = doc.getElementsByTagNameNS(doc.namespaceURI, "mergeCell")
-        else:
-            mergeCells = doc.getElementsByTagName("mergeCell")
-        for mergeCell in mergeCells:
-            attrs = mergeCell._attrs
-            if 'ref' in attrs.keys():
-                rangeStr = attrs['ref'].value
-                rng = rangeStr.split(":")
-                if len(rng) > 1:
-                    for cell in self._range(rangeStr):
-                        self.mergeCells[cell] = {}
-                        self.mergeCells[cell]['copyFrom'] = rng[0]
+        # merged ranges are kept as intervals [startRow, endRow, startCol, endCol, anchor value]
+        # sorted by start row, only ranges covering the current row are checked
+        for rangeStr in self._prescan()[0]:
+            rng = rangeStr.split(":")
+            if len(rng) > 1:
+                start = self._cell_position(rng[0])
+                end = self._cell_position(rng[1])
+                if start and end:
+                    self.mergeRanges.append([start[1], end[1], start[0], end[0], None])
+        self.mergeRanges.sort(key=lambda rng: rng[0])
 
     def set_scifloat(self, scifloat):
         self.scifloat = scifloat
 
-    def set_include_hyperlinks(self, hyperlinks):
-        if not hyperlinks or not self.relationships or not self.relationships.relationships:
+    def set_stats(self, stats):
+        # instrumented read and value conversion are swapped in, so disabled stats cost nothing
+        self.stats = stats
+        if stats is None:
             return
-        # we must read file first to get hyperlinks, but we don't wont to parse whole file
-        if not self.filedata:
-            self.filedata = self.filehandle.read()
-        data = str(self.filedata)  # python3: convert byte buffer to string
-
-        # find worksheet tag, we need namespaces from it
-        start = data.find("<worksheet")
-        if start < 0:
+        self.filehandle = TimedReader(self.filehandle, stats)
+        self._convert_value = self._counted_convert_value
+
+    def set_read_ahead(self, read_ahead, chunk_size):
+        self.read_ahead = read_ahead
+        self.read_chunk_size = chunk_size
+
+    def set_cancel(self, cancel):
+        self.filehandle = CancellableReader(self.filehandle, cancel)
+
+    def set_write_batch(self, batch_rows, queue_size):
+        self.write_batch = batch_rows
+        self.write_behind = queue_size
+
+    def set_progress(self, progress, every, size):
+        # progress(rows, total, rate) is called every `every` written rows, total is estimated from
+        # <dimension> or from the parsed share of the size bytes of the uncompressed sheet part
+        self.progress = progress
+        self.progressNext = every
+        self.progressEvery = every
+        self.sheetSize = size
+        self.progressStarted = perf_counter()
+
+    def set_values(self, values):
+        # "formatted" applies number formats, "native" gives python values of the resolved type,
+        # "serial" keeps numbers and date serials as floats
+        self.values = values
+
+    def set_rows(self, start, end):
+        # rows before start are parsed for merged cells only, parsing stops after the end row
+        self.startRow = start
+        self.endRow = end
+        if start is not None:
+            self.lastRowNum = start - 1
+
+    def set_max_rows(self, max_rows):
+        self.max_rows = max_rows
+
+    def set_columns(self, columns):
+        # column number -> position in the output row, other cells are skipped before their value is read
+        if not columns:
             return
-        end = data.find(">", start)
-        worksheet = data[start: end + 1]
+        self.projection = {}
+        for position, column in enumerate(columns):
+            self.projection[column] = position
+        self.columns_count = len(columns)
 
-        # find hyperlinks part
-        start = data.find("<hyperlinks>")
-        if start < 0:
-            # hyperlinks not found
+    def set_include_hyperlinks(self, hyperlinks):
+        if not hyperlinks or not self.relationships or not self.relationships.relationships:
             return
-        end = data.find("</hyperlinks>")
-        data = data[start: end + 13]
-
-        # parse hyperlinks
-        doc = minidom.parseString(worksheet + data + "</worksheet>").firstChild
-        if doc.namespaceURI:
-            hiperlinkNodes = doc.getElementsByTagNameNS(doc.namespaceURI, "hyperlink")
-        else:
-            hiperlinkNodes = doc.getElementsByTagName("hyperlink")
-        for hlink in hiperlinkNodes:
-            attrs = hlink._attrs
-            ref = rId = None
-            for k in attrs.keys():
-                if k == "ref":
-                    ref = str(attrs[k].value)
-                if k.endswith(":id"):
-                    rId = str(attrs[k].value)
-            if not ref or not rId:
-                continue
+        for ref, rId in self._prescan()[1]:
             rel = self.relationships.relationships.get(rId)
             if not rel:
                 continue
@@ -855,144 +2345,207 @@ class Sheet:
             for cell in self._range(ref):
                 self.hyperlinks[cell] = target
 
+    def _prescan(self):
+        """
+         Collect merge cell and hyperlink refs in a streaming pass over the worksheet,
+         returns ([mergeCell ref, ...], [(hyperlink ref, relation id), ...])
+        """
+        if self.prescanned is not None:
+            return self.prescanned
+        mergeRefs = []
+        hyperlinks = []
+
+        def handleStartElement(name, attrs):
+            name = name[name.find(":") + 1:]
+            if name == 'mergeCell' and attrs.get('ref'):
+                mergeRefs.append(attrs['ref'])
+            elif name == 'hyperlink':
+                ref = attrs.get('ref')
+                rId = None
+                for k in attrs.keys():
+                    if k.endswith(":id"):
+                        rId = attrs[k]
+                if ref and rId:
+                    hyperlinks.append((str(ref), str(rId)))
+
+        # <mergeCells> and <hyperlinks> follow <sheetData>, raw bytes are only searched until
+        # the first of them shows up, from there on the rest of the file goes to expat
+        parser = None
+        root = None
+        data = b""
+        filehandle = self.filehandleOpener()
+        try:
+            for chunk in iter(lambda: filehandle.read(SHEET_READ_CHUNK_SIZE), b""):
+                if parser is not None:
+                    parser.Parse(chunk, False)
+                    continue
+                data = data + chunk
+                if root is None:
+                    m = ROOT_ELEMENT_RE.search(data)
+                    if not m:
+                        continue
+                    root = m.group(1)
+                m = PRESCAN_ELEMENT_RE.search(data)
+                if m:
+                    parser = xml.parsers.expat.ParserCreate()
+                    parser.StartElementHandler = handleStartElement
+                    parser.Parse(b"<" + root + b">", False)
+                    parser.Parse(data[m.start():], False)
+                else:
+                    # keep a tail, the tag may be split between chunks
+                    data = data[-PRESCAN_OVERLAP:]
+            if parser is not None:
+                parser.Parse(b"", True)
+        finally:
+            filehandle.close()
+
+        self.prescanned = (mergeRefs, hyperlinks)
+        return self.prescanned
+
     def to_csv(self, writer):
         self.writer = writer
+        if self.stats:
+            self.writer = TimedWriter(writer, self.stats)
+        if self.max_rows == 0:
+            return
+        if self.write_batch > 1 or self.write_behind:
+            self.batchWriter = BatchWriter(self.writer, self.write_batch, self.write_behind, self.stats)
+            self.writer = self.batchWriter
+        self._create_parser()
+        windowDone = False
+        try:
+            if self.read_ahead:
+                for chunk in self._chunks():
+                    self.parser.Parse(chunk, False)
+                self.parser.Parse(b"", True)
+            else:
+                self.parser.ParseFile(self.filehandle)
+        except SheetWindowDone:
+            windowDone = True
+        if self.batchWriter:
+            batchWriter, self.batchWriter = self.batchWriter, None
+            batchWriter.close()
+        if windowDone:
+            # rest of the sheet is not inflated
+            self.close()
+        if self.progress is not None and self.progressNext != self.rowsWritten + self.progressEvery:
+            # not reported yet at the last row
+            self._report_progress(True)
+
+    def iter_rows(self):
+        # parse sheet chunk by chunk, handing out rows collected from each chunk,
+        # so only rows of a single chunk are kept in memory
+        buffer = RowBuffer()
+        self.writer = buffer
+        if self.max_rows == 0:
+            return
+        self._create_parser()
+        try:
+            for chunk in self._chunks():
+                self.parser.Parse(chunk, False)
+                if buffer.rows:
+                    rows, buffer.rows = buffer.rows, []
+                    for row in rows:
+                        yield row
+            self.parser.Parse(b"", True)
+        except SheetWindowDone:
+            self.close()
+        for row in buffer.rows:
+            yield row
+        buffer.rows = []
+
+    def _chunks(self):
+        # type: () -> Iterator[bytes]
+        if self.read_ahead:
+            self.reader = ReadAheadReader(self.filehandle, self.read_chunk_size, self.read_ahead)
+            return self.reader.chunks()
+        return iter(lambda: self.filehandle.read(self.read_chunk_size), b"")
+
+    def _create_parser(self):
         self.parser = xml.parsers.expat.ParserCreate()
         self.parser.buffer_text = True
         self.parser.CharacterDataHandler = self.handleCharData
         self.parser.StartElementHandler = self.handleStartElement
         self.parser.EndElementHandler = self.handleEndElement
-        if self.filedata:
-            self.parser.Parse(self.filedata)
-        else:
-            self.parser.ParseFile(self.filehandle)
 
     def handleCharData(self, data):
         if self.in_cell_value:
-            format_type = None
-            format_str = "general"
             self.data += data
-            if self.colType == "s":  # shared string
-                format_type = "string"
-                self.data = self.sharedStrings[int(data)]
-
-                # Handle cell string data that has \r\n by changing the value that expat uses for the \r to an empty string.
-                # This happens a lot with older versions of excel, and the character conversion is happening inside expat.
-                if self.data.find(XMLPARSER_WINDOWS_NEWLINE_STR) > -1:
-                    self.data = self.data.replace(XMLPARSER_WINDOWS_NEWLINE_STR, "\n")
-            elif self.colType == "b":  # boolean
-                format_type = "boolean"
+            self.has_value_text = True
+
+    def _convert_value(self):
+        # called at the end of <v> or <t>, text split over several character data events is complete
+        formatter = None
+        data = self.data
+        if self.colType == "s":  # shared string
+            if self.sharedStrings is None:
+                self.sharedStrings = self.sharedStringsLoader().strings
+            self.data = self.sharedStrings[int(data)]
+        elif self.colType == "b":  # boolean
+            if self.values != "formatted":
+                self.data = int(data) != 0
+            else:
                 self.data = (int(data) == 1 and "TRUE") or (int(data) == 0 and "FALSE") or data
-            elif self.colType == "str" or self.colType == "inlineStr":
-                format_type = "string"
-
-                # Again, check for the \r\n change and clear the apply hack
-                if data.find(XMLPARSER_WINDOWS_NEWLINE_STR) > -1:
-                    self.data = self.data.replace(XMLPARSER_WINDOWS_NEWLINE_STR, "\n")
-            elif self.s_attr:
-                s = int(self.s_attr)
-
-                # get cell format
-                xfs_numfmt = None
-                if s < len(self.styles.cellXfs):
-                    xfs_numfmt = self.styles.cellXfs[s]
-                if xfs_numfmt in self.styles.numFmts:
-                    format_str = self.styles.numFmts[xfs_numfmt]
-                elif xfs_numfmt in STANDARD_FORMATS:
-                    format_str = STANDARD_FORMATS[xfs_numfmt]
-
-                # get format type
-                if not format_str:
-                    raise XlsxValueError("unknown format %s at %d" % (format_str, xfs_numfmt))
-
-                if format_str in FORMATS:
-                    format_type = FORMATS[format_str]
-                elif re.match(r"^\d+(\.\d+)?$", self.data) and re.match(".*[hsmdyY]", format_str) and not re.match(
-                        r".*\[.*[dmhys].*\]", format_str):
-                    # it must be date format
-                    if float(self.data) < 1:
-                        format_type = "time"
-                    else:
-                        format_type = "date"
-                elif re.match(r"^-?\d+(.\d+)?$", self.data) or (
-                            self.scifloat and re.match(r"^-?\d+(.\d+)?([eE]-?\d+)?$", self.data)):
-                    format_type = "float"
-                if format_type == 'date' and self.dateformat == 'float':
-                    format_type = "float"
-            elif self.colType == "n":
-                format_type = "float"
-            elif not self.colType and len(self.data) and self.data[0] >= '0' and self.data[0] <= '9':
-                # default assumption for a cell without t attribute is that it is a number
-                format_type = "float"
-
-            if format_type and not format_type in self.ignore_formats and self.data not in EXCEL_ERROR_VALUES:
+        elif self.colType == "str" or self.colType == "inlineStr":
+            # check for the \r\n change and clear the apply hack, see SharedStrings.handleEndElement
+            if data.find(XMLPARSER_WINDOWS_NEWLINE_STR) > -1:
+                self.data = self.data.replace(XMLPARSER_WINDOWS_NEWLINE_STR, "\n")
+            if self.escape_strings:
+                self.data = escape_string(self.data)
+        elif self.values == "serial":
+            # numbers and date serials as floats, without number formats
+            if (self.s_attr or self.colType == "n" or (not self.colType and len(data) and '0' <= data[0] <= '9')) \
+                    and data not in EXCEL_ERROR_VALUES:
                 try:
-                    if format_type == 'date':  # date/time
-                        if self.workbook.date1904:
-                            date = datetime.datetime(1904, 1, 1) + datetime.timedelta(float(self.data))
-                        else:
-                            date = datetime.datetime(1899, 12, 30) + datetime.timedelta(float(self.data))
-                        if self.dateformat:
-                            # str(dateformat) - python2.5 bug, see: http://bugs.python.org/issue2782
-                            self.data = date.strftime(str(self.dateformat))
-                        else:
-                            # ignore ";@", don't know what does it mean right now
-                            # ignore "[$-409], [$-f409], [$-16001]" and similar format codes
-                            dateformat = re.sub(r"\[\$\-[A-z0-9]*\]", "", format_str, count=1) \
-                                .replace(";@", "").replace("yyyy", "%Y").replace("yy", "%y") \
-                                .replace("hh:mm", "%H:%M").replace("h", "%I").replace("%H%H", "%H") \
-                                .replace("ss", "%S").replace("dddd", "d").replace("dd", "d").replace("d", "%d") \
-                                .replace("am/pm", "%p").replace("mmmm", "%B").replace("mmm", "%b") \
-                                .replace(":mm", ":%M").replace("m", "%m").replace("%m%m", "%m")
-                            self.data = date.strftime(str(dateformat)).strip()
-                    elif format_type == 'time':  # time
-                        t = int(round((float(self.data) % 1) * 24 * 60 * 60, 6))  # it should be in seconds
-                        d = datetime.time(int((t // 3600) % 24), int((t // 60) % 60), int(t % 60))
-                        self.data = d.strftime(self.timeformat)
-                    elif format_type == 'float':
-                        data = float(self.data)
-                        if not self.floatformat and data.is_integer():
-                            # repr(float(...)) - workaround to correctly round precision for floats
-                            # repr gives same result on python 2 and 3, while str is different on python 2
-                            self.data = "%i" % Decimal(repr(float(self.data)))
-                        elif ('E' in self.data or 'e' in self.data) or self.floatformat:
-                            self.data = (str(self.floatformat or '%f') % data).rstrip('0').rstrip('.')
-                        # if cell is general, be aggressive about stripping any trailing 0s, decimal points, etc.
-                        elif format_str == 'general':
-                            self.data = ("%f" % data).rstrip('0').rstrip('.')
-                        elif format_str[0:3] == '0.0':
-                            if self.floatformat:
-                                self.data = str(self.floatformat) % data
-                            else:
-                                L = len(format_str.split(".")[1])
-                                if '%' in format_str:
-                                    L += 1
-                                self.data = ("%." + str(L) + "f") % data
-                        else:
-                            # unsupported float formatting
-                            self.data = ("%f" % data).rstrip('0').rstrip('.')
-                    elif format_type == 'percentage':
-                        if not self.ignore_percentage:
-                            # Always round .5 up, not to nearest even as round() does.
-                            with localcontext() as ctx:
-                                ctx.rounding = ROUND_HALF_UP
-                                if format_str == "0.00%":
-                                    quant = "1.00"
-                                else:
-                                    quant = "1"
-                                data = (Decimal(self.data) * 100).quantize(Decimal(quant))
-                                self.data = str(data) + "%"
-                        else:
-                            # When ignoring percentage formatting, output the raw decimal value
-                            self.data = ("%f" % float(self.data)).rstrip('0').rstrip('.')
+                    self.data = float(data)
+                except ValueError:
+                    pass
+        elif self.s_attr:
+            formatter = self.formatters.get(self.s_attr) or self._compile_formatter(self.s_attr)
+        elif self.colType == "n" or (not self.colType and len(self.data) and self.data[0] >= '0' and self.data[0] <= '9'):
+            # default assumption for a cell without t attribute is that it is a number
+            formatter = self.formatters.get(None) or self._compile_formatter(None)
+
+        if formatter is None:
+            return
+        outputs = formatter.natives if self.values == "native" else formatter.outputs
+        output = outputs.get(formatter.format_type or formatter.get_type(self.data))
+        if output is not None and self.data not in EXCEL_ERROR_VALUES:
+            try:
+                self.data = output(self.data)
+            except (ValueError, OverflowError):  # this catch must be removed, it's hiding potential problems
+                if self.ignore_invalid_char_data:
+                    # If invalid character data or excel formulas are encountered,
+                    # we set the data to empty string to avoid conversion errors
+                    self.data = ""
+                else:
+                    raise XlsxValueError("Error: potential invalid date format.")
+
+    def _counted_convert_value(self):
+        data = self.data
+        started = perf_counter()
+        Sheet._convert_value(self)
+        self.stats.add("format", perf_counter() - started)
+
+        if self.colType == "s":
+            self.stats.count("shared_string_lookups")
+        elif self.colType == "b":
+            self.stats.count("cells_boolean")
+        elif self.colType == "str" or self.colType == "inlineStr":
+            self.stats.count("cells_string")
+        elif self.s_attr or self.colType == "n" or (not self.colType and len(data) and '0' <= data[0] <= '9'):
+            formatter = self.formatters.get(self.s_attr) or self._compile_formatter(self.s_attr)
+            self.stats.count("cells_" + (formatter.format_type or formatter.get_type(data) or "other"))
+        else:
+            self.stats.count("cells_other")
 
-                except (ValueError, OverflowError):  # this catch must be removed, it's hiding potential problems
-                    if self.options['ignore_invalid_char_data']:
-                        # If invalid character data or excel formulas are encountered,
-                        # we set the data to empty string to avoid conversion errors
-                        self.data = ""
-                    else:
-                        raise XlsxValueError("Error: potential invalid date format.")
+    def _compile_formatter(self, s_attr):
+        if s_attr is None:
+            cell_format = GENERAL_CELL_FORMAT
+        else:
+            cell_format = self.styles.get_cell_format(int(s_attr))
+        formatter = self.formatters[s_attr] = CellFormatter(cell_format, self)
+        return formatter
 
     def handleStartElement(self, name, attrs):
         has_namespace = name.find(":") > 0
@@ -1005,30 +2558,48 @@ class Sheet:
                 self.colIndex = 0
             else:
                 self.colIndex += 1
+            t = 0
+            for i in self.colNum: t = t * 26 + ord(i) - 64
+            self.col = t + self.colIndex
+            self.rowHasCells = True
+            if (self.skipRow or (self.projection is not None and self.col not in self.projection)) and \
+                    not self._is_merge_anchor():
+                return
             self.data = ""
             self.in_cell = True
         elif self.in_cell and ((name == 'v' or name == 't') or (has_namespace and (name.endswith(':v') or name.endswith(':t')))):
             self.in_cell_value = True
+            self.has_value_text = False
         elif self.in_sheet and (name == 'row' or (has_namespace and name.endswith(':row'))) and not (self.skip_hidden_rows and 'hidden' in attrs and attrs['hidden'] == '1'):
             self.rowIndex += 1
             if 'r' in attrs:
                 self.rowNum = attrs['r']
             else:
                 self.rowNum = str(self.rowIndex)
+            row = int(self.rowNum)
+            if self.endRow is not None and row > self.endRow:
+                raise SheetWindowDone()
+            self.skipRow = self.startRow is not None and row < self.startRow
             self.in_row = True
             self.colIndex = 0
             self.colNum = ""
             self.columns = {}
+            self.rowHasCells = False
             self.spans = None
             if 'spans' in attrs:
                 self.spans = [int(i) for i in attrs['spans'].split(" ")[-1].split(":")]
+            if self.mergeRanges:
+                self._update_merge_ranges(row)
 
         elif name == 'sheetData' or (has_namespace and name.endswith(':sheetData')):
             self.in_sheet = True
             self.rowIndex = 0
         elif name == 'dimension':
-            rng = attrs.get("ref").split(":")
-            if len(rng) > 1:
+            rng = attrs.get("ref", "").split(":")
+            end = self._cell_position(rng[-1])
+            if end:
+                self.dimensionEndRow = end[1]
+            if len(rng) > 1 and self.projection is None:
                 start = re.match(r"^([A-Z]+)(\d+)$", rng[0])
                 if (start):
                     end = re.match(r"^([A-Z]+)(\d+)$", rng[1])
@@ -1042,30 +2613,39 @@ class Sheet:
         has_namespace = name.find(":") > 0
         if self.in_cell and ((name == 'v' or name == 't') or (has_namespace and (name.endswith(':v') or name.endswith(':t')))):
             self.in_cell_value = False
+            if self.has_value_text:
+                self._convert_value()
         elif self.in_cell and (name == 'c' or (has_namespace and name.endswith(':c'))):
-            t = 0
-            for i in self.colNum: t = t * 26 + ord(i) - 64
             d = self.data
-            if self.hyperlinks:
+            if self.hyperlinks and isinstance(d, str):
                 hyperlink = self.hyperlinks.get(self.cellId)
                 if hyperlink:
                     d = "<a href='" + hyperlink + "'>" + d + "</a>"
-            if self.colNum + self.rowNum in self.mergeCells.keys():
-                if 'copyFrom' in self.mergeCells[self.colNum + self.rowNum].keys() and \
-                                self.mergeCells[self.colNum + self.rowNum]['copyFrom'] == self.colNum + self.rowNum:
-                    self.mergeCells[self.colNum + self.rowNum]['value'] = d
-                else:
-                    d = self.mergeCells[self.mergeCells[self.colNum + self.rowNum]['copyFrom']]['value']
+            if self.mergeActive:
+                col = self.col
+                for rng in self.mergeActive:
+                    if rng[2] <= col <= rng[3]:
+                        if col == rng[2] and int(self.rowNum) == rng[0]:
+                            rng[4] = d
+                        else:
+                            d = rng[4] if rng[4] is not None else ""
+                        break
 
-            if self.no_line_breaks:
+            if self.no_line_breaks and isinstance(d, str):
               d = d.replace("\r", " ").replace("\n", " ").replace("\t", " ")
 
-            self.columns[t - 1 + self.colIndex] = d
+            if self.projection is None:
+                self.columns[self.col - 1] = d
+            elif self.col in self.projection:
+                self.columns[self.projection[self.col]] = d
             self.in_cell = False
 
         if self.in_row and (name == 'row' or (has_namespace and name.endswith(':row'))):
-            if len(self.columns.keys()) > 0:
-                if min(self.columns.keys()) < 0: # Weird
+            # with a projection, rows with cells are written even if none of them is projected
+            if self.skipRow:
+                pass
+            elif len(self.columns.keys()) > 0 or (self.projection is not None and self.rowHasCells):
+                if len(self.columns.keys()) > 0 and min(self.columns.keys()) < 0: # Weird
                     d = []
                     keys = self.columns.keys()
                     keys.sort()
@@ -1075,13 +2655,16 @@ class Sheet:
                             val = val.encode("utf-8")
                         d.append(val)
                 else:
-                    d = [""] * (max(self.columns_count, max(self.columns.keys()) + 1))
+                    width = self.columns_count
+                    if len(self.columns.keys()) > 0:
+                        width = max(width, max(self.columns.keys()) + 1)
+                    d = [""] * width
                     for k in self.columns.keys():
                         val = self.columns[k]
                         if not self.py3:
                             val = val.encode("utf-8")
                         d[k] = val
-                if self.spans:
+                if self.spans and self.projection is None:
                     l = self.spans[1]
                     if len(d) < l:
                         d += (l - len(d)) * ['']
@@ -1091,7 +2674,7 @@ class Sheet:
                 # write empty lines
                 if not self.skip_empty_lines:
                     for i in range(self.lastRowNum, int(self.rowNum) - 1):
-                        self.writer.writerow([])
+                        self._writerow([])
                     self.lastRowNum = int(self.rowNum)
 
                 # write line to csv
@@ -1107,12 +2690,84 @@ class Sheet:
                                 self.max_columns = self.max_columns - 1
                         elif self.max_columns > 0:
                             d = d[0:self.max_columns]
-                    self.writer.writerow(d)
+                    self._writerow(d)
 
             self.in_row = False
+            if self.endRow is not None and int(self.rowNum) >= self.endRow:
+                raise SheetWindowDone()
         elif self.in_sheet and (name == 'sheetData' or (has_namespace and name.endswith(':sheetData'))):
             self.in_sheet = False
 
+    def _writerow(self, row):
+        self.writer.writerow(row)
+        self.rowsWritten += 1
+        if self.rowsWritten == self.progressNext:
+            self._report_progress()
+        if self.max_rows is not None and self.rowsWritten >= self.max_rows:
+            raise SheetWindowDone()
+
+    def _report_progress(self, done=False):
+        rows = self.rowsWritten
+        self.progressNext = rows + self.progressEvery
+        elapsed = perf_counter() - self.progressStarted
+        rate = rows / elapsed if elapsed > 0 else 0.0
+        self.progress(rows, rows if done else self._estimate_rows(), rate)
+
+    def _estimate_rows(self):
+        # type: () -> Optional[int]
+        """Expected rows of the sheet, from <dimension> unless it is already exceeded, else from bytes parsed"""
+        rows = self.rowsWritten
+        first = self.startRow or 1
+        last = self.dimensionEndRow
+        if last is not None and self.endRow is not None:
+            last = min(last, self.endRow)
+        total = None
+        if last is not None and last - first + 1 >= rows:
+            total = last - first + 1
+        else:
+            parsed = self.parser.CurrentByteIndex if self.parser else -1
+            if self.sheetSize and parsed > 0:
+                total = max(rows, int(rows * float(self.sheetSize) / parsed))
+                if self.endRow is not None:
+                    total = min(total, self.endRow - first + 1)
+        if total is not None and self.max_rows is not None:
+            total = min(total, self.max_rows)
+        return total
+
+    def _is_merge_anchor(self):
+        # anchors of merged ranges are read even outside of the projection, their value is copied
+        # to the other cells of the range
+        if self.mergeActive:
+            row = int(self.rowNum)
+            for rng in self.mergeActive:
+                if rng[2] == self.col and rng[0] == row:
+                    return True
+        return False
+
+    def _update_merge_ranges(self, row):
+        # drop ranges the parser is past, together with their anchor values
+        active = []
+        for rng in self.mergeActive:
+            if rng[1] >= row:
+                active.append(rng)
+            else:
+                rng[4] = None
+        while self.mergeNext < len(self.mergeRanges) and self.mergeRanges[self.mergeNext][0] <= row:
+            rng = self.mergeRanges[self.mergeNext]
+            if rng[1] >= row:
+                active.append(rng)
+            self.mergeNext += 1
+        self.mergeActive = active
+
+    # cellRef: "C12", returns (column number, row number) or None
+    def _cell_position(self, cellRef):
+        m = CELL_REF_RE.match(cellRef)
+        if not m:
+            return None
+        t = 0
+        for i in m.group(1): t = t * 26 + ord(i) - 64
+        return t, int(m.group(2))
+
     # rangeStr: "A3:C12" or "D5"
     # example: for cell in _range("A1:Z12"): print cell
     def _range(self, rangeStr):
@@ -1142,34 +2797,138 @@ class Sheet:
                     t = t // 26 - 1
 
 
-def convert_recursive(path, sheetid, outfile, kwargs, continue_on_error=False):
-    # type: (str, int, Union[str, TextIO], Dict[str, Any], bool) -> None
-    for name in os.listdir(path):
-        fullpath = os.path.join(path, name)
-        if os.path.isdir(fullpath):
-            convert_recursive(fullpath, sheetid, outfile, kwargs, continue_on_error)
-        else:
-            outfilepath = outfile
-            if isinstance(outfilepath, type(sys.stdout)):
-                outfilepath = fullpath[:-4] + 'csv'
-            elif os.path.isdir(outfilepath):
-                outfilepath = os.path.join(outfilepath, name[:-4] + 'csv')
-            elif len(outfilepath) == 0 and fullpath.lower().endswith(".xlsx"):
-                outfilepath = fullpath[:-4] + 'csv'
+_sheet_worker = None  # type: Optional[Xlsx2csv]
+_sheet_progress = None
+
+
+def _init_sheet_worker(converter, progress):
+    # type: (Xlsx2csv, Optional[Callable[[int, Optional[int], float], None]]) -> None
+    global _sheet_worker, _sheet_progress
+    converter._reopen()
+    _sheet_worker = converter
+    _sheet_progress = progress
+
+
+def _convert_sheet_worker(job):
+    # type: (Tuple[int, str]) -> Optional[Dict[str, Any]]
+    sheet_index, outfile = job
+    # stats of the job only, the parent adds them to its own
+    if _sheet_worker.stats is not None:
+        _sheet_worker.stats = Stats()
+    _sheet_worker._convert(sheet_index, outfile, _sheet_progress)
+    return _sheet_worker.stats and _sheet_worker.stats.as_dict()
+
 
+def convert_recursive(path, sheetid, outfile, kwargs, continue_on_error=False, file_pattern=None):
+    # type: (str, int, Union[str, TextIO], Dict[str, Any], bool, Optional[List[str]]) -> None
+    """Convert workbooks found under path, files are converted in kwargs['jobs'] worker processes"""
+    jobs = kwargs.get('jobs', 1)
+    if jobs > 1 and ProcessPoolExecutor is not None:
+        # parallelism is spent on files, every workbook converts its sheets serially
+        worker_kwargs = dict(kwargs, jobs=1)
+        executor = ProcessPoolExecutor(jobs)
+        try:
+            pending = {}
+            for fullpath, outfilepath in _recursive_jobs(path, outfile, file_pattern):
+                # bound the number of submitted files, a drop directory may hold a lot of them
+                if len(pending) >= jobs * 2:
+                    done = wait(pending, return_when=FIRST_COMPLETED)[0]
+                    _check_conversions(pending, done, continue_on_error)
+                print("Converting %s to %s" % (fullpath, outfilepath))
+                future = executor.submit(_convert_file, fullpath, outfilepath, sheetid, worker_kwargs)
+                pending[future] = fullpath
+            _check_conversions(pending, list(pending), continue_on_error)
+        except:
+            for future in pending:
+                future.cancel()
+            raise
+        finally:
+            executor.shutdown()
+    else:
+        for fullpath, outfilepath in _recursive_jobs(path, outfile, file_pattern):
             print("Converting %s to %s" % (fullpath, outfilepath))
             try:
-                with Xlsx2csv(fullpath, **kwargs) as xlsx2csv:
-                    xlsx2csv.convert(outfilepath, sheetid)
+                _convert_file(fullpath, outfilepath, sheetid, kwargs)
             except Exception as e:
-                if continue_on_error:
-                    print("ERROR processing file '%s': %s" % (fullpath, str(e)), file=sys.stderr)
-                    continue
-                else:
-                    if isinstance(e, zipfile.BadZipfile):
-                        raise InvalidXlsxFileException("File %s is not a zip file" % fullpath)
-                    else:
-                        raise
+                _conversion_failed(fullpath, e, continue_on_error)
+
+
+def _recursive_jobs(path, outfile, file_pattern=None):
+    # type: (str, Union[str, TextIO], Optional[List[str]]) -> Iterator[Tuple[str, Union[str, TextIO]]]
+    patterns = [pattern.lower() for pattern in (file_pattern or ["*.xlsx", "*.xlsm"])]
+    directories = [path]
+    while directories:
+        subdirectories = []
+        for entry in sorted(os.scandir(directories.pop()), key=lambda entry: entry.name):
+            if entry.is_dir():
+                subdirectories.append(entry.path)
+                continue
+            name = entry.name.lower()
+            if not any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+                continue
+            outfilepath = outfile
+            if isinstance(outfilepath, type(sys.stdout)):
+                outfilepath = os.path.splitext(entry.path)[0] + '.csv'
+            elif os.path.isdir(outfilepath):
+                outfilepath = os.path.join(outfilepath, os.path.splitext(entry.name)[0] + '.csv')
+            elif len(outfilepath) == 0:
+                outfilepath = os.path.splitext(entry.path)[0] + '.csv'
+            yield entry.path, outfilepath
+        # depth first, in name order
+        directories.extend(reversed(subdirectories))
+
+
+def _convert_file(fullpath, outfilepath, sheetid, kwargs):
+    # type: (str, Union[str, TextIO], int, Dict[str, Any]) -> None
+    with Xlsx2csv(fullpath, **kwargs) as xlsx2csv:
+        xlsx2csv.convert(outfilepath, sheetid)
+
+
+def _check_conversions(pending, futures, continue_on_error):
+    # futures are removed from pending, reporting errors in submission order
+    for future in [future for future in pending if future in futures]:
+        fullpath = pending.pop(future)
+        e = future.exception()
+        if e is not None:
+            _conversion_failed(fullpath, e, continue_on_error)
+
+
+def _conversion_failed(fullpath, e, continue_on_error):
+    # type: (str, Exception, bool) -> None
+    if continue_on_error:
+        print("ERROR processing file '%s': %s" % (fullpath, str(e)), file=sys.stderr)
+    elif isinstance(e, zipfile.BadZipfile):
+        raise InvalidXlsxFileException("File %s is not a zip file" % fullpath)
+    else:
+        raise e
+
+
+def list_sheets(xlsxfile, outfile, kwargs):
+    # type: (Union[str, IO[bytes]], Union[str, TextIO], Dict[str, Any]) -> None
+    """Write index, name, state and dimension of every sheet as csv rows"""
+    info = Xlsx2csv.inspect(xlsxfile)
+    closefile = False
+    if isinstance(outfile, str):
+        outfile = open(outfile, 'w+', encoding=kwargs['outputencoding'], newline="")
+        closefile = True
+    try:
+        writer = csv.writer(outfile, quoting=kwargs['quoting'], delimiter=kwargs['delimiter'],
+                            lineterminator=kwargs['lineterminator'])
+        writer.writerow(["index", "name", "state", "dimension"])
+        for sheet in info['sheets']:
+            writer.writerow([sheet['index'], sheet['name'], sheet['state'], sheet['dimension'] or ""])
+    finally:
+        if closefile:
+            outfile.close()
+
+
+def print_progress(rows, total, rate):
+    # type: (int, Optional[int], float) -> None
+    if total:
+        sys.stderr.write("%i of ~%i rows (%i%%), %.0f rows/s\n" % (rows, total, 100 * rows // max(total, 1), rate))
+    else:
+        sys.stderr.write("%i rows, %.0f rows/s\n" % (rows, rate))
+    sys.stderr.flush()
 
 
 def main():
@@ -1247,6 +3006,46 @@ def main():
                         help="continue processing remaining files when an error occurs during batch processing")
     parser.add_argument("--ignore-percentage", dest="ignore_percentage", default=False, action="store_true",
                         help="ignore percentage formatting and output raw values")
+    parser.add_argument("--shared-strings", dest="shared_strings_mode", default="list", choices=SHARED_STRINGS_MODES,
+                        help="shared strings storage, 'list' keeps them in memory, 'packed' keeps them in a single "
+                             "memory buffer, 'indexed' spools them to a temporary file and decodes on demand "
+                             "(default: list)")
+    parser.add_argument("--stdin-spool-size", dest="stdin_spool_size", default=STDIN_SPOOL_SIZE, type=inttype,
+                        metavar="BYTES", help="bytes of a workbook piped to stdin kept in memory, larger input is "
+                                              "spooled to a temporary file, 0 keeps all of it in memory "
+                                              "(default: %i)" % STDIN_SPOOL_SIZE)
+    parser.add_argument("--stdin-spool-dir", dest="stdin_spool_dir", default=None, metavar="DIR",
+                        help="directory of the stdin spool file (default: system temporary directory)")
+    parser.add_argument("--columns", dest="columns", default=None,
+                        help="only output the given columns in the given order, ex. A,C:F")
+    parser.add_argument("--rows", dest="rows", default=None,
+                        help="only output rows of the given window, ex. 10:20, 10: or :20")
+    parser.add_argument("--max-rows", dest="max_rows", default=None, type=inttype,
+                        help="stop after writing the given number of rows of a sheet")
+    parser.add_argument("--read-ahead", dest="read_ahead", default=0, type=inttype, metavar="CHUNKS",
+                        help="inflate up to CHUNKS sheet chunks in a background thread while parsing (default: 0, off)")
+    parser.add_argument("--read-chunk-size", dest="read_chunk_size", default=SHEET_READ_CHUNK_SIZE, type=inttype,
+                        metavar="BYTES", help="bytes of sheet data parsed at once (default: %i)" % SHEET_READ_CHUNK_SIZE)
+    parser.add_argument("--write-batch", dest="write_batch", default=1, type=inttype, metavar="ROWS",
+                        help="pass ROWS rows at once to the csv writer (default: 1)")
+    parser.add_argument("--write-behind", dest="write_behind", default=0, type=inttype, metavar="BATCHES",
+                        help="write rows from a background thread, queueing up to BATCHES batches (default: 0, off)")
+    parser.add_argument("--write-buffer", dest="write_buffer", default=-1, type=inttype, metavar="BYTES",
+                        help="output buffer size, 1 buffers lines (default: system default)")
+    parser.add_argument("--progress", dest="progress", default=False, action="store_true",
+                        help="report converted rows, estimated total and rows per second to stderr")
+    parser.add_argument("--progress-every", dest="progress_every", default=100000, type=inttype, metavar="ROWS",
+                        help="rows between --progress reports (default: 100000)")
+    parser.add_argument("--stats", dest="stats", default=False, action="store_true",
+                        help="print phase times and counters of the conversion to stderr as json")
+    parser.add_argument("--list-sheets", dest="list_sheets", default=False, action="store_true",
+                        help="list index, name, state and dimension of the sheets instead of converting")
+    parser.add_argument("-j", "--jobs", dest="jobs", default=1, type=inttype,
+                        help="number of worker processes converting sheets in parallel when -a option is enabled, "
+                             "or files in parallel when converting a directory (default: 1)")
+    parser.add_argument("--file-pattern", nargs=nargs_plus, dest="file_pattern", default=None,
+                        help="only convert files matching the given glob patterns when converting a directory "
+                             "(default: *.xlsx *.xlsm)")
 
     if argparser:
         options = parser.parse_args()
@@ -1304,6 +3103,16 @@ def main():
     else:
         sys.exit("error: invalid sheet delimiter\n")
 
+    if options.max_rows is not None and options.max_rows < 0:
+        sys.exit("error: invalid max rows\n")
+
+    # stats and progress are reported for the conversion of one workbook
+    for flag, enabled in (("--stats", options.stats), ("--progress", options.progress)):
+        if enabled and options.list_sheets:
+            sys.exit("error: %s can not be used with --list-sheets\n" % flag)
+        if enabled and os.path.isdir(options.infile):
+            sys.exit("error: %s can not be used with a directory\n" % flag)
+
     kwargs = {
         'delimiter': options.delimiter,
         'quoting': options.quoting,
@@ -1325,28 +3134,59 @@ def main():
         'lineterminator': options.lineterminator,
         'ignore_formats': options.ignore_formats,
         'skip_hidden_rows': not options.include_hidden_rows,
-        'ignore_percentage': options.ignore_percentage
+        'ignore_percentage': options.ignore_percentage,
+        'shared_strings_mode': options.shared_strings_mode,
+        'stdin_spool_size': options.stdin_spool_size,
+        'stdin_spool_dir': options.stdin_spool_dir,
+        'jobs': options.jobs,
+        'columns': options.columns,
+        'rows': options.rows,
+        'max_rows': options.max_rows,
+        'stats': options.stats,
+        'progress_every': options.progress_every,
+        'read_ahead': options.read_ahead,
+        'read_chunk_size': options.read_chunk_size,
+        'write_batch': options.write_batch,
+        'write_behind': options.write_behind,
+        'write_buffer': options.write_buffer
     }
     sheetid = options.sheetid
     if options.all:
         sheetid = 0
 
     outfile = options.outfile or sys.stdout
+    if outfile is sys.stdout and options.write_buffer > 0 and sys.version_info[0] == 3:
+        # binary buffers have no line buffering, 1 is passed on to the text layer as for output files
+        line_buffering = options.write_buffer == 1
+        outfile = io.TextIOWrapper(io.open(sys.stdout.fileno(), "wb", -1 if line_buffering else options.write_buffer,
+                                           closefd=False),
+                                   encoding=sys.stdout.encoding, errors=sys.stdout.errors, line_buffering=line_buffering)
     try:
         if os.path.isdir(options.infile):
-            convert_recursive(options.infile, sheetid, outfile, kwargs, options.continue_on_error)
+            file_pattern = options.file_pattern
+            if type(file_pattern) == type(""):  # optparser lib fix
+                file_pattern = [file_pattern]
+            convert_recursive(options.infile, sheetid, outfile, kwargs, options.continue_on_error, file_pattern)
         elif not os.path.exists(options.infile) and options.infile != "-":
             raise InvalidXlsxFileException("Input file not found!")
+        elif options.list_sheets:
+            list_sheets(options.infile, outfile, kwargs)
         else:
             with Xlsx2csv(options.infile, **kwargs) as xlsx2csv:
                 if options.sheetname:
                     sheetid = xlsx2csv.getSheetIdByName(options.sheetname)
                     if not sheetid:
                         sys.exit("Sheet '%s' not found" % options.sheetname)
-                xlsx2csv.convert(outfile, sheetid)
+                xlsx2csv.convert(outfile, sheetid, progress=print_progress if options.progress else None)
+                if xlsx2csv.stats:
+                    json.dump(xlsx2csv.stats.as_dict(), sys.stderr, indent=2, sort_keys=True)
+                    sys.stderr.write("\n")
     except XlsxException:
         _, e, _ = sys.exc_info()
         sys.exit(str(e) + "\n")
+    finally:
+        if outfile is not sys.stdout and not options.outfile:
+            outfile.flush()
 
 
 if __name__ == "__main__":